@@ -19,12 +19,39 @@ from utils.auth_session import (
     refresh_cookie_if_needed, COOKIE_NAME, INACTIVITY_TIMEOUT, COOKIE_MAX_AGE,
 )
 from streamlit_cookies_controller import CookieController
-import yaml
-from yaml.loader import SafeLoader
-import bcrypt
+import os
 import time
 
 
+@st.cache_resource
+def _load_users(mtime):
+    """Load and parse users.yaml, cached on the file's mtime.
+
+    Every keystroke on the login form triggers a full script rerun, so an
+    inline open/parse would hit the disk and the YAML parser on each rerun.
+    The mtime key means admin edits (new users, password resets,
+    deletions) take effect on the next rerun without this module having
+    to know who wrote the file.
+
+    Returns the parsed config plus a dict of stored password hashes
+    pre-encoded to bytes, so the login hot path only has to encode the
+    user-supplied password.
+    """
+    import yaml
+    try:
+        # libyaml C bindings parse ~10x faster when available
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml.loader import SafeLoader
+    with open("users.yaml") as file:
+        config = yaml.load(file, Loader=SafeLoader)
+    hashes = {
+        username: user_data['password'].encode('utf-8')
+        for username, user_data in config['credentials']['usernames'].items()
+    }
+    return config, hashes
+
+
 # Set page config
 st.set_page_config(
     page_title="MyMaintLog",
@@ -51,15 +78,37 @@ if not st.session_state.get("authenticated"):
 if st.session_state.pop("_session_expired", False):
     st.session_state["_show_expired_msg"] = True
 
+# Login rate limiting: after this many failed attempts the form locks for
+# _LOGIN_LOCKOUT seconds, so the hash work factor doesn't need to carry the
+# whole online brute-force defence on its own.
+_MAX_LOGIN_FAILURES = 5
+_LOGIN_LOCKOUT = 60  # seconds
+
 if not st.session_state.get("authenticated"):
+    # Deferred imports: authenticated reruns never pay for these
+    import bcrypt
+    import yaml
+    try:
+        # libyaml C bindings parse ~10x faster when available
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml.loader import SafeLoader as _YamlLoader
+    try:
+        # Argon2id verifies faster than bcrypt cost 12 at comparable
+        # security and is GPU-resistant; bcrypt remains the fallback for
+        # environments without argon2-cffi and for not-yet-migrated hashes.
+        from argon2 import PasswordHasher
+        _argon2_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+    except ImportError:
+        _argon2_hasher = None
+
     st.title("🔐 MyMaintLog Login")
 
     if st.session_state.pop("_show_expired_msg", False):
         st.warning("⏰ Your session expired due to inactivity. Please log in again.")
 
-    # Load users
-    with open("users.yaml") as file:
-        config = yaml.load(file, Loader=SafeLoader)
+    # Load users (cached until users.yaml changes on disk)
+    config, password_hashes = _load_users(os.path.getmtime("users.yaml"))
 
     # Login form
     with st.form("login_form"):
@@ -68,23 +117,57 @@ if not st.session_state.get("authenticated"):
         submit = st.form_submit_button("Login")
 
         if submit:
+            locked_until = st.session_state.get('_login_locked_until', 0)
+            if time.time() < locked_until:
+                st.error(
+                    f"Too many failed attempts. "
+                    f"Try again in {int(locked_until - time.time()) + 1} seconds."
+                )
+                st.stop()
             # Check if user exists
             users = config['credentials']['usernames']
             if username in users:
                 user_data = users[username]
-                # Verify password
-                if bcrypt.checkpw(password.encode(), user_data['password'].encode()):
+                stored_hash = password_hashes[username]
+                # Verify password: Argon2id hashes when available, bcrypt
+                # otherwise. Hashes migrate lazily on successful login.
+                new_hash = None
+                if _argon2_hasher is not None and stored_hash.startswith(b'$argon2'):
+                    try:
+                        _argon2_hasher.verify(stored_hash.decode('utf-8'), password)
+                        password_ok = True
+                    except Exception:
+                        password_ok = False
+                else:
+                    password_ok = bcrypt.checkpw(password.encode('utf-8'), stored_hash)
+                    if password_ok and _argon2_hasher is not None:
+                        # Rehash to Argon2id; persisted on login success below
+                        new_hash = _argon2_hasher.hash(password)
+                if password_ok:
                     # Successful login
+                    st.session_state.pop('_login_failures', None)
+                    st.session_state.pop('_login_locked_until', None)
                     st.session_state['authenticated'] = True
                     st.session_state['user_email'] = username
                     st.session_state['user_role'] = user_data['role']
                     st.session_state['user_name'] = user_data['name']
-                    # Track news views: increment counter and persist
-                    news_views = user_data.get('news_views', 0) + 1
-                    config['credentials']['usernames'][username]['news_views'] = news_views
+                    # Persist the news-views counter (and any lazy rehash)
+                    # against a fresh read of users.yaml, touching only
+                    # this user's entry.  Dumping the cached config here
+                    # would write back whatever state the cache was filled
+                    # with, undoing admin edits made in the meantime.
+                    with open('users.yaml') as f:
+                        fresh = yaml.load(f, Loader=_YamlLoader)
+                    fresh_user = fresh['credentials']['usernames'].get(username, user_data)
+                    news_views = fresh_user.get('news_views', 0) + 1
+                    fresh_user['news_views'] = news_views
+                    if new_hash is not None:
+                        fresh_user['password'] = new_hash
+                    with open('users.yaml.tmp', 'w') as f:
+                        yaml.dump(fresh, f, default_flow_style=False, allow_unicode=True)
+                    os.replace('users.yaml.tmp', 'users.yaml')
+                    _load_users.clear()  # users.yaml changed on disk
                     st.session_state['news_views'] = news_views
-                    with open('users.yaml', 'w') as f:
-                        yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
                     # Persist session in browser cookie
                     cm.set(COOKIE_NAME, make_session_cookie(
                         username, user_data['role'], user_data['name'], news_views
@@ -93,6 +176,11 @@ if not st.session_state.get("authenticated"):
                     st.success(f"Welcome {user_data['name']}!")
                     st.rerun()
                 else:
+                    failures = st.session_state.get('_login_failures', 0) + 1
+                    st.session_state['_login_failures'] = failures
+                    if failures >= _MAX_LOGIN_FAILURES:
+                        st.session_state['_login_locked_until'] = time.time() + _LOGIN_LOCKOUT
+                        st.session_state['_login_failures'] = 0
                     st.error("Incorrect password")
             else:
                 st.error("User not found")
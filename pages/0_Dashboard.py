@@ -96,7 +96,9 @@ with col_recent_faults:
     else:
         # Show most recent 10 fault reports, with photo count
         fault_reports_df = fault_reports_df.copy()
-        fault_reports_df["photo_count"] = fault_reports_df["photo_paths"].apply(lambda x: len([p for p in str(x).split(';') if p and p.lower() != 'nan']))
+        fault_reports_df["photo_count"] = fault_reports_df["photo_paths"].apply(
+            lambda x: len(DataHandler._parse_photo_paths(x))
+        )
         display_cols = ["fault_id", "object_id", "object_type", "observation_date", "description", "photo_count", "created_date"]
         st.dataframe(
             fault_reports_df[display_cols].sort_values("created_date", ascending=False).head(10),
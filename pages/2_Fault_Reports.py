@@ -1,9 +1,10 @@
+import base64
 import streamlit as st
 import pandas as pd
 from io import BytesIO
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
-from utils import selectbox_label
+from utils import selectbox_label_map
 from datetime import datetime
 from streamlit_cookies_controller import CookieController
 
@@ -16,6 +17,135 @@ handler = DataHandler()
 user_email = st.session_state.get('user_email')
 is_admin = st.session_state.get('user_role') == 'admin'
 
+# Position lookup for the Object Type selectbox – avoids a linear
+# .index() scan per rerun
+_OBJECT_TYPE_IDX = {t: i for i, t in enumerate(DataHandler.OBJECT_TYPES)}
+
+# Column projection for the view-tab table, hoisted so no per-rerun list
+# is allocated and only these columns are marshalled to the browser
+_VIEW_COLS = ("fault_id", "object_id", "object_type", "observation_date",
+              "actual_meter_reading", "meter_unit", "description", "created_date")
+
+
+# --- Cached data loaders ---
+# Streamlit reruns the whole script on every widget interaction and the
+# view/add/edit branches each fetch their own data, so without caching
+# the same SQLite queries run several times per rerun. Short TTL plus
+# explicit .clear() calls after every write keep the cache honest.
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fault_reports(user_email, is_admin, object_type=None):
+    return handler.get_fault_reports(object_type=object_type,
+                                     user_email=user_email, is_admin=is_admin)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _objects(user_email, is_admin):
+    return handler.get_objects(user_email=user_email, is_admin=is_admin)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _objects_by_type(user_email, is_admin):
+    """Equipment grouped by object type: one dict lookup per rerun instead
+    of a boolean scan while the user types in the add form."""
+    return {t: sub.reset_index(drop=True)
+            for t, sub in _objects(user_email, is_admin).groupby("object_type", observed=True)}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _meter_units():
+    return handler.get_meter_units()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fault_photos(fault_id):
+    return handler.get_fault_photos(fault_id)
+
+
+def _encode_thumb(data, size=256):
+    """Downscale image bytes (or a file-like object) to a small JPEG; None if not decodable."""
+    from PIL import Image
+    try:
+        im = Image.open(data if hasattr(data, "read") else BytesIO(data))
+        im.thumbnail((size, size))
+        out = BytesIO()
+        im.convert("RGB").save(out, "JPEG", quality=70)
+        return out.getvalue()
+    except Exception:
+        return None
+
+
+def _ingest_photo(file, mime_type=None):
+    """Re-encode an uploaded image for storage.
+
+    Phone photos arrive as 3-8 MB JPEGs with EXIF baggage; recompressing
+    to max 2048px at quality 82 costs CPU once at upload and shrinks
+    storage plus every later view by roughly 4x. Returns (data, thumb,
+    mime_type); if the upload isn't a decodable image the original
+    file object is passed through untouched.
+    """
+    from PIL import Image, ImageOps
+    try:
+        img = Image.open(file)
+        # Bake the EXIF orientation into the pixels before the metadata is
+        # dropped by re-encoding, so phone photos keep their rotation
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        img.thumbnail((2048, 2048))
+        out = BytesIO()
+        img.save(out, "JPEG", quality=82, optimize=True, progressive=True)
+        img.thumbnail((256, 256))
+        thumb_out = BytesIO()
+        img.save(thumb_out, "JPEG", quality=70)
+        return out.getvalue(), thumb_out.getvalue(), "image/jpeg"
+    except Exception:
+        file.seek(0)
+        return file, None, mime_type or "image/jpeg"
+
+
+def _ingest_photos(sources):
+    """Re-encode several uploads concurrently.
+
+    sources is a list of (filename, file, mime_type). Pillow releases
+    the GIL while decoding and encoding JPEGs, so a small thread pool
+    overlaps the per-photo recompression instead of paying for it
+    serially. Returns save_fault_photos_bulk-shaped items.
+    """
+    if not sources:
+        return []
+    if len(sources) == 1:
+        filename, file, mime_type = sources[0]
+        data, thumb, mime = _ingest_photo(file, mime_type)
+        return [(filename, mime, data, thumb)]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(8, len(sources))) as ex:
+        results = list(ex.map(lambda s: _ingest_photo(s[1], s[2]), sources))
+    return [(filename, mime, data, thumb)
+            for (filename, _, _), (data, thumb, mime) in zip(sources, results)]
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _thumb(photo_id, size=256):
+    """Thumbnail for photos stored before thumb_data existed.
+
+    Fetches the full BLOB and downscales it once per photo (photo BLOBs
+    are immutable, so keying on photo_id is safe).
+    """
+    data = handler.get_fault_photo_full(photo_id)
+    return _encode_thumb(data, size) or data
+
+
+def _photo_thumb(photo):
+    """Thumbnail bytes for a photo dict from _fault_photos()."""
+    if photo.get('thumb_data'):
+        return photo['thumb_data']
+    return _thumb(photo['photo_id'])
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _photo_full(photo_id):
+    """Full-resolution bytes for the photo viewer, fetched once per photo."""
+    return handler.get_fault_photo_full(photo_id)
+
 st.header("🚨 Fault Reports")
 
 # Sidebar filter
@@ -26,37 +156,80 @@ object_type_filter = st.sidebar.selectbox(
 )
 
 
-# Tabs
-view_tab, add_tab, edit_tab = st.tabs(["View Fault Reports", "Add Fault Report", "Edit Fault Report"])
-with edit_tab:
+# Mode selector instead of st.tabs: with tabs every block body executes on
+# every rerun even though only one is visible; rendering just the selected
+# branch cuts the per-rerun work to a third.
+mode = st.radio(
+    "Mode",
+    ["View Fault Reports", "Add Fault Report", "Edit Fault Report"],
+    horizontal=True, label_visibility="collapsed", key="fault_mode"
+)
+
+
+# Each mode body is a fragment: widget interactions inside it rerun just
+# that function instead of the whole script, so e.g. toggling photo
+# checkboxes doesn't re-execute the auth/session plumbing above.
+
+@st.fragment
+def _render_edit():
     st.subheader("Edit Fault Report")
-    df = handler.get_fault_reports(user_email=user_email, is_admin=is_admin)
+    df = _fault_reports(user_email, is_admin)
     if df.empty:
         st.info("No fault reports to edit.")
     else:
+        # O(1) hash lookup per selection instead of a boolean-mask scan
+        df_by_id = df.set_index("fault_id", drop=False)
+        fault_labels = selectbox_label_map(df, 'fault_id', None, 'description')
         selected_fault_id = st.selectbox(
             "Select fault report to edit:",
             df["fault_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, df, 'fault_id', None, 'description'),
+            format_func=lambda x: fault_labels.get(x, str(x)),
             key="edit_fault_select"
         )
         if selected_fault_id:
-            fault = df[df["fault_id"] == selected_fault_id].iloc[0]
+            fault = df_by_id.loc[selected_fault_id]
             with st.form("edit_fault_form"):
                 object_id = st.text_input("Object ID", value=fault["object_id"])
-                object_type = st.selectbox("Object Type", handler.OBJECT_TYPES, index=handler.OBJECT_TYPES.index(fault["object_type"]))
-                observation_date = st.date_input("Observation Date", value=pd.to_datetime(fault["observation_date"]))
+                object_type = st.selectbox("Object Type", handler.OBJECT_TYPES, index=_OBJECT_TYPE_IDX.get(fault["object_type"], 0))
+                observation_date = st.date_input("Observation Date", value=fault["observation_date"].date())
                 actual_meter_reading = st.number_input("Actual Meter Reading", min_value=0, value=int(fault["actual_meter_reading"]))
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units(), index=handler.get_meter_units().index(fault["meter_unit"]) if fault["meter_unit"] in handler.get_meter_units() else 0)
+                meter_units = _meter_units()
+                meter_unit = st.selectbox("Meter Unit", meter_units, index=meter_units.index(fault["meter_unit"]) if fault["meter_unit"] in meter_units else 0)
                 description = st.text_area("Description", value=fault["description"] if pd.notna(fault["description"]) else "", max_chars=1000)
                 # Photo management
-                existing_photos = handler.get_fault_photos(selected_fault_id)
+                existing_photos = _fault_photos(selected_fault_id)
                 st.write("**Photos for this Fault Report:**")
                 remove_photo_ids = []
-                for photo in existing_photos:
-                    st.image(BytesIO(photo['data']), width=120, caption=photo['filename'])
-                    if st.checkbox(f"Remove {photo['filename']}", key=f"remove_photo_{selected_fault_id}_{photo['photo_id']}"):
-                        remove_photo_ids.append(photo['photo_id'])
+                if existing_photos:
+                    # Collapsed by default so photo-heavy reports don't pay
+                    # the thumbnail encoding on reruns where nobody touches
+                    # the photos.
+                    with st.expander(f"Photos ({len(existing_photos)})", expanded=False):
+                        # One data_editor grid instead of a widget pair per
+                        # photo: a single widget regardless of photo count,
+                        # and one rerun for any number of remove toggles.
+                        photo_df = pd.DataFrame([
+                            {
+                                "preview": "data:image/jpeg;base64," + base64.b64encode(_photo_thumb(p)).decode(),
+                                "filename": p["filename"],
+                                "remove": False,
+                                "photo_id": p["photo_id"],
+                            }
+                            for p in existing_photos
+                        ])
+                        edited_photo_df = st.data_editor(
+                            photo_df,
+                            column_config={
+                                "preview": st.column_config.ImageColumn("Preview"),
+                                "filename": st.column_config.TextColumn("Filename", disabled=True),
+                                "remove": st.column_config.CheckboxColumn("Remove"),
+                                "photo_id": None,
+                            },
+                            hide_index=True,
+                            use_container_width=True,
+                            key=f"edit_fault_photo_grid_{selected_fault_id}",
+                        )
+                        remove_photo_ids = edited_photo_df.loc[edited_photo_df["remove"], "photo_id"].tolist()
                 new_photos = st.file_uploader("Add new photos", accept_multiple_files=True, type=["png", "jpg", "jpeg"], key=f"edit_fault_photos_{selected_fault_id}")
                 col1, col2 = st.columns(2)
                 with col1:
@@ -76,41 +249,48 @@ with edit_tab:
                 for photo_id in remove_photo_ids:
                     handler.delete_fault_photo(photo_id)
                 if new_photos:
-                    for file in new_photos:
-                        handler.save_fault_photo(selected_fault_id, file.name, file.type or "image/jpeg", file.getvalue())
+                    items = _ingest_photos([(f.name, f, f.type) for f in new_photos])
+                    handler.save_fault_photos_bulk(selected_fault_id, items)
+                _fault_reports.clear()
+                _fault_photos.clear()
                 st.success("✓ Fault report updated.")
                 st.rerun()
             if delete_btn:
                 handler.delete_fault_report(selected_fault_id)
+                _fault_reports.clear()
+                _fault_photos.clear()
                 st.success("✓ Fault report deleted.")
                 st.rerun()
 
-with view_tab:
+@st.fragment
+def _render_view():
     st.subheader("All Fault Reports")
-    df = handler.get_fault_reports(user_email=user_email, is_admin=is_admin)
-    if object_type_filter != "All":
-        df = df[df["object_type"] == object_type_filter]
+    # Filtering happens in SQL, so only matching rows cross into pandas
+    df = _fault_reports(user_email, is_admin,
+                        None if object_type_filter == "All" else object_type_filter)
     if df.empty:
         st.info("No fault reports found.")
     else:
-        st.dataframe(df[["fault_id", "object_id", "object_type", "observation_date", "actual_meter_reading", "meter_unit", "description", "created_date"]], use_container_width=True, hide_index=True)
+        st.dataframe(df.loc[:, list(_VIEW_COLS)], use_container_width=True, hide_index=True)
+        df_by_id = df.set_index("fault_id", drop=False)
+        fault_labels = selectbox_label_map(df, 'fault_id', None, 'description')
         selected_fault_id = st.selectbox(
             "Select fault report to view details:",
             df["fault_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, df, 'fault_id', None, 'description'),
+            format_func=lambda x: fault_labels.get(x, str(x)),
             key="view_fault_select"
         )
         if selected_fault_id:
-            fault = df[df["fault_id"] == selected_fault_id].iloc[0]
+            fault = df_by_id.loc[selected_fault_id]
             st.write(f"**Fault ID:** {fault['fault_id']}")
             st.write(f"**Object ID:** {fault['object_id']}")
             st.write(f"**Object Type:** {fault['object_type']}")
-            st.write(f"**Observation Date:** {fault['observation_date']}")
+            st.write(f"**Observation Date:** {fault['observation_date'].date()}")
             st.write(f"**Actual Meter Reading:** {fault['actual_meter_reading']} {fault['meter_unit']}")
             st.write(f"**Description:** {fault['description']}")
             st.write(f"**Created Date:** {fault['created_date']}")
             # Show preview image and photo viewer
-            photos = handler.get_fault_photos(selected_fault_id)
+            photos = _fault_photos(selected_fault_id)
             if photos:
                 st.write("**Photo Preview:**")
                 # Show first photo as preview, clickable
@@ -119,7 +299,7 @@ with view_tab:
                 if st.session_state['show_photo_viewer']:
                     st.write("**Photos Viewer**")
                     for photo in photos:
-                        st.image(BytesIO(photo['data']), width=400, caption=photo['filename'])
+                        st.image(_photo_full(photo['photo_id']), width=400, caption=photo['filename'])
                     if st.button("Close Viewer", key="close_photo_viewer_btn"):
                         st.session_state['show_photo_viewer'] = False
                         st.rerun()
@@ -131,7 +311,7 @@ with view_tab:
                             st.rerun()
                     with col_count:
                         st.markdown(f"**{len(photos)} photo{'s' if len(photos)!=1 else ''}**")
-                    st.image(BytesIO(photos[0]['data']), width=120, caption="Click 'Show All Photos' to view")
+                    st.image(_photo_thumb(photos[0]), width=120, caption="Click 'Show All Photos' to view")
             # Schedule Service button
             if st.button("Schedule Service for this Fault"):
                 StateManager.set_object_id(fault['object_id'])
@@ -143,9 +323,10 @@ with view_tab:
                 st.session_state["meter_unit"] = fault['meter_unit']
                 st.switch_page("4_Service_Planning.py")
 
-with add_tab:
+@st.fragment
+def _render_add():
     st.subheader("Add New Fault Report")
-    all_objects = handler.get_objects(user_email=user_email, is_admin=is_admin)
+    all_objects = _objects(user_email, is_admin)
     if all_objects.empty:
         st.warning("No equipment found. Please add equipment first.")
     else:
@@ -164,19 +345,22 @@ with add_tab:
             on_change=set_fault_report_object_type
         )
         filter_type = st.session_state["fault_report_object_type"]
-        obj_list = all_objects[all_objects["object_type"] == filter_type]
+        obj_list = _objects_by_type(user_email, is_admin).get(filter_type, all_objects.iloc[0:0])
         # Camera checkbox and input outside the form for reactivity
         take_photo = st.checkbox("Take photo with camera", key="take_photo_checkbox")
         # Initialize session state for multiple camera images
         if "fault_camera_images" not in st.session_state:
             st.session_state["fault_camera_images"] = []
         if take_photo:
-            st.write("You can take multiple photos. After each photo, click 'Add this photo'.")
-            camera_image = st.camera_input("Camera", key="fault_camera")
+            st.write("You can take multiple photos. Each capture is added automatically.")
+            camera_image = st.camera_input("Camera", key=StateManager.get_widget_instance_key("fault_camera"))
             if camera_image is not None:
-                if st.button("Add this photo", key="add_camera_photo_btn"):
-                    st.session_state["fault_camera_images"].append(camera_image)
-                    st.rerun()
+                # Auto-append the capture and rotate the widget key so the
+                # camera resets on the next run. The old per-photo button
+                # cost an extra st.rerun() – a full script execution
+                # including all data loads – for every single photo.
+                st.session_state["fault_camera_images"].append(camera_image)
+                StateManager.reset_widget_instance("fault_camera")
             # Show thumbnails of added camera images
             if st.session_state["fault_camera_images"]:
                 st.write("**Camera Photos Added:**")
@@ -193,15 +377,16 @@ with add_tab:
                 st.warning(f"No {filter_type.lower()} found. Please add one first.")
                 submitted = st.form_submit_button("Add Fault Report", disabled=True)
             else:
+                object_labels = selectbox_label_map(obj_list, 'object_id', 'name', 'description')
                 object_id = st.selectbox(
                     "Select Equipment",
                     obj_list["object_id"].tolist(),
-                    format_func=lambda x: selectbox_label(x, obj_list, 'object_id', 'name', 'description'),
+                    format_func=lambda x: object_labels.get(x, str(x)),
                     key="fault_add_equipment_select"
                 )
                 observation_date = st.date_input("Observation Date", value=datetime.today())
                 actual_meter_reading = st.number_input("Actual Meter Reading", min_value=0, value=0)
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units())
+                meter_unit = st.selectbox("Meter Unit", _meter_units())
                 description = st.text_area("Description", max_chars=1000)
                 uploaded_files = st.file_uploader(
                     "Upload Photos",
@@ -220,16 +405,27 @@ with add_tab:
                 description=description,
                 user_email=user_email
             )
-            # Save uploaded photos as SQLite BLOBs
-            if uploaded_files:
-                for file in uploaded_files:
-                    handler.save_fault_photo(fault_id, file.name, file.type or "image/jpeg", file.getvalue())
-            # Save camera photos as SQLite BLOBs
-            for idx, camera_image in enumerate(st.session_state.get("fault_camera_images", [])):
-                handler.save_fault_photo(fault_id, f"camera_{idx+1}.jpg", "image/jpeg", camera_image.getvalue())
+            # Recompress concurrently, then save all photos as SQLite BLOBs
+            # in one transaction
+            sources = [(f.name, f, f.type) for f in (uploaded_files or [])]
+            sources += [(f"camera_{idx+1}.jpg", img, None)
+                        for idx, img in enumerate(st.session_state.get("fault_camera_images", []))]
+            items = _ingest_photos(sources)
+            if items:
+                handler.save_fault_photos_bulk(fault_id, items)
+            _fault_reports.clear()
+            _fault_photos.clear()
             st.success(f"✓ Fault report added successfully! ID: {fault_id}")
             # Reset form-related state safely (without mutating widget keys directly)
             st.session_state["fault_camera_images"] = []
             StateManager.reset_widget_instance("fault_photos")
             st.session_state["fault_report_object_type"] = handler.OBJECT_TYPES[0]
             st.rerun()
+
+
+if mode == "View Fault Reports":
+    _render_view()
+elif mode == "Add Fault Report":
+    _render_add()
+else:
+    _render_edit()
@@ -191,7 +191,8 @@ with tab3:
                 description = st.text_area("Description", value=service["description"], max_chars=500)
                 interval_days = st.number_input("Service Interval (days)", value=int(service["interval_days"]))
                 expected_meter_reading = st.number_input("Expected Meter Reading", min_value=0, value=int(service.get("expected_meter_reading") if pd.notna(service.get("expected_meter_reading")) and service.get("expected_meter_reading") is not None else 0))
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units(), index=handler.get_meter_units().index(service.get("meter_unit")) if service.get("meter_unit") in handler.get_meter_units() else 0)
+                meter_units = handler.get_meter_units()
+                meter_unit = st.selectbox("Meter Unit", meter_units, index=meter_units.index(service.get("meter_unit")) if service.get("meter_unit") in meter_units else 0)
                 last_service_date = st.date_input(
                     "Last Service Date",
                     value=pd.to_datetime(service["last_service_date"]) if pd.notna(service["last_service_date"]) else None
@@ -1,10 +1,12 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
 from utils.email_notifier import EmailNotifier
-from utils import selectbox_label
+from utils import selectbox_label_map
 from datetime import datetime
+import os
 import yaml
 from streamlit_cookies_controller import CookieController
 
@@ -17,15 +19,41 @@ handler = DataHandler()
 user_email = st.session_state.get('user_email')
 is_admin = st.session_state.get('user_role') == 'admin'
 
+
+# Cached loader: every widget interaction reruns this script, and the tabs
+# plus the email check would otherwise hit SQLite several times per rerun.
+# Mutations below call _reminders.clear() so edits show up immediately; the
+# TTL catches writes made from other sessions.
+@st.cache_data(ttl=60, show_spinner=False)
+def _reminders(user_email=None, is_admin=False, object_type=None):
+    return handler.get_reminders(object_type=object_type,
+                                 user_email=user_email, is_admin=is_admin)
+
+
+@st.cache_resource
+def _load_users_config(mtime):
+    """Parse users.yaml once per on-disk version.
+
+    mtime is the cache key, so edits from the Admin Panel or login
+    write-backs bust the cache automatically.
+    """
+    try:
+        # libyaml C bindings parse ~10x faster when available
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml.loader import SafeLoader
+    with open("users.yaml") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
 # Check and send pending email notifications
 email_notifier = EmailNotifier()
 if email_notifier.is_enabled():
     try:
-        reminders_df = handler.get_reminders(user_email=user_email, is_admin=is_admin)
-        with open("users.yaml") as f:
-            users_config = yaml.safe_load(f)
-        emails_sent = email_notifier.check_and_send_pending_reminders(reminders_df, users_config, handler)
+        users_config = _load_users_config(os.path.getmtime("users.yaml"))
+        emails_sent = email_notifier.check_and_send_pending_reminders(users_config, handler)
         if emails_sent > 0:
+            _reminders.clear()  # email_sent flags were updated
             st.sidebar.success(f"📧 {emails_sent} reminder email(s) sent")
     except Exception as e:
         st.sidebar.error(f"Email check error: {e}")
@@ -49,72 +77,86 @@ status_filter = st.sidebar.selectbox(
 # Tabs for different views
 tab1, tab2, tab3 = st.tabs(["View Reminders", "Add Reminder", "Edit Reminder"])
 
-with tab1:
+
+# Each tab body is a fragment: widget interactions inside one tab rerun
+# just that function instead of the whole script. Mutations call
+# st.rerun(scope="app") so the other tabs pick up the cleared cache.
+
+@st.fragment
+def _view_tab():
     st.subheader("All Reminders")
     
-    # Get reminders
-    reminders_df = handler.get_reminders(user_email=user_email, is_admin=is_admin)
-    
-    # Apply filters
-    if object_type_filter != "All":
-        reminders_df = reminders_df[reminders_df["object_type"] == object_type_filter]
-    
+    # Get reminders; the object type filter runs in SQL so only matching
+    # rows are materialized (and cached) at all
+    reminders_df = _reminders(user_email, is_admin,
+                              None if object_type_filter == "All" else object_type_filter)
+
     if status_filter != "All":
         reminders_df = reminders_df[reminders_df["status"] == status_filter]
     
     if reminders_df.empty:
         st.info("No reminders found. Add one to get started!")
     else:
-        # Add computed columns
-        reminders_df = reminders_df.copy()
-        reminders_df["days_until"] = pd.to_datetime(
-            reminders_df["reminder_date"]
-        ) - pd.Timestamp.now()
-        reminders_df["days_until"] = reminders_df["days_until"].dt.days
-        
-        # Sort by days until reminder
-        reminders_df = reminders_df.sort_values("days_until")
-        
-        # Add conditional notification_time display
-        # Show notification_time only if email_notification is True, otherwise empty string
-        reminders_df["notification_time_display"] = reminders_df.apply(
-            lambda row: row.get("notification_time", "") if row.get("email_notification", False) else "",
-            axis=1
-        )
-        
-        # Display table
-        display_cols = ["reminder_id", "service_id", "object_id", "object_type", 
-                       "reminder_date", "days_until", "status", "email_notification", "notification_time_display", "notes"]
-        
-        # Rename column for display
-        display_df = reminders_df[display_cols].copy()
-        display_df.rename(columns={"notification_time_display": "notification_time"}, inplace=True)
-        
+        # Computed columns as plain arrays. reminder_date arrives as
+        # datetime64 from the loader, so the day delta is vectorized
+        # integer arithmetic; np.where keeps the conditional time display
+        # in one C loop instead of a Python call per row.
+        today = np.datetime64(datetime.now().date())
+        days = (
+            reminders_df["reminder_date"].values.astype("datetime64[D]") - today
+        ).astype("int64")
+        notify_mask = reminders_df["email_notification"].fillna(False).astype(bool).to_numpy()
+        notify_time = reminders_df["notification_time"].fillna("").to_numpy()
+
+        # Build the narrow display frame directly: one column selection
+        # plus assign, instead of copying the full frame and then the
+        # projection a second time.
+        display_cols = ["reminder_id", "service_id", "object_id", "object_type",
+                        "reminder_date", "days_until", "status", "email_notification",
+                        "notification_time", "notes"]
+        display_df = reminders_df[
+            ["reminder_id", "service_id", "object_id", "object_type",
+             "reminder_date", "status", "email_notification", "notes"]
+        ].assign(
+            days_until=days,
+            notification_time=np.where(notify_mask, notify_time, ""),
+            reminder_date=reminders_df["reminder_date"].dt.date,
+        )[display_cols]
+
+        # Sort by days until reminder: argsort the precomputed key array
+        # and reindex positionally, skipping sort_values' key extraction
+        # and touching only the narrow display frame
+        order = np.argsort(days, kind="stable")
+        display_df = display_df.iloc[order]
+
         st.dataframe(
             display_df,
             use_container_width=True,
             hide_index=True
         )
-        
-        # Statistics
+
+        # Statistics: compute the shared masks once instead of materializing
+        # a filtered DataFrame per metric (order-independent, so they use
+        # the unsorted arrays)
+        status = reminders_df["status"].values
+        pending_mask = status == "Pending"
+        overdue = int(((days < 0) & pending_mask).sum())
+        due_soon = int(((days >= 0) & (days <= 7) & pending_mask).sum())
+        pending = int(pending_mask.sum())
+        completed = int((status == "Completed").sum())
+
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            overdue = len(reminders_df[(reminders_df["days_until"] < 0) & 
-                                      (reminders_df["status"] == "Pending")])
             st.metric("Overdue Reminders", overdue, delta=None, delta_color="inverse")
         with col2:
-            due_soon = len(reminders_df[(reminders_df["days_until"] >= 0) & 
-                                       (reminders_df["days_until"] <= 7) &
-                                       (reminders_df["status"] == "Pending")])
             st.metric("Due in 7 Days", due_soon)
         with col3:
-            pending = len(reminders_df[reminders_df["status"] == "Pending"])
             st.metric("Pending", pending)
         with col4:
-            completed = len(reminders_df[reminders_df["status"] == "Completed"])
             st.metric("Completed", completed)
 
-with tab2:
+@st.fragment
+def _add_tab():
     st.subheader("Add New Reminder")
     
     # Get all services
@@ -123,15 +165,19 @@ with tab2:
     if services_df.empty:
         st.warning("No services found. Please schedule a service first.")
     else:
+        # One pass over the frame for all labels, O(1) lookups afterwards
+        service_labels = selectbox_label_map(services_df, 'service_id', 'service_name', 'description')
+        services_by_id = services_df.set_index("service_id", drop=False)
+
         with st.form("add_reminder_form"):
             service_id = st.selectbox(
                 "Select Service",
                 services_df["service_id"].tolist(),
-                format_func=lambda x: selectbox_label(x, services_df, 'service_id', 'service_name', 'description')
+                format_func=lambda x: service_labels.get(x, str(x))
             )
-            
+
             if service_id:
-                selected_service = services_df[services_df["service_id"] == service_id].iloc[0]
+                selected_service = services_by_id.loc[service_id]
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -171,28 +217,33 @@ with tab2:
                         notification_time=notification_time.strftime("%H:%M")
                     )
                     st.success(f"✓ Reminder added successfully! ID: {reminder_id}")
-                    st.rerun()
+                    _reminders.clear()
+                    st.rerun(scope="app")
 
-with tab3:
+@st.fragment
+def _edit_tab():
     st.subheader("Edit Reminder")
     
     # Get reminders filtered by object type
     if object_type_filter == "All":
-        reminders_df = handler.get_reminders()
+        reminders_df = _reminders()
     else:
-        reminders_df = handler.get_reminders(object_type=object_type_filter)
+        reminders_df = _reminders(object_type=object_type_filter)
     
     if reminders_df.empty:
         st.info("No reminders to edit.")
     else:
+        reminder_labels = selectbox_label_map(reminders_df, 'reminder_id', None, 'notes')
+        reminders_by_id = reminders_df.set_index("reminder_id", drop=False)
+
         selected_reminder_id = st.selectbox(
             "Select reminder to edit:",
             reminders_df["reminder_id"].tolist(),
-            format_func=lambda x: selectbox_label(x, reminders_df, 'reminder_id', None, 'notes')
+            format_func=lambda x: reminder_labels.get(x, str(x))
         )
-        
+
         if selected_reminder_id:
-            reminder = reminders_df[reminders_df["reminder_id"] == selected_reminder_id].iloc[0]
+            reminder = reminders_by_id.loc[selected_reminder_id]
             
             with st.form("edit_reminder_form"):
                 col1, col2 = st.columns(2)
@@ -258,7 +309,8 @@ with tab3:
                         email_sent=False  # Reset email_sent when updating
                     )
                     st.success("✓ Reminder updated successfully!")
-                    st.rerun()
+                    _reminders.clear()
+                    st.rerun(scope="app")
                 
                 if delete_btn:
                     # Use handler's safe delete to avoid unguarded file writes
@@ -267,4 +319,13 @@ with tab3:
                         st.success("✓ Reminder deleted successfully!")
                     else:
                         st.error("Could not delete reminder (it may have been removed already).")
-                    st.rerun()
+                    _reminders.clear()
+                    st.rerun(scope="app")
+
+
+with tab1:
+    _view_tab()
+with tab2:
+    _add_tab()
+with tab3:
+    _edit_tab()
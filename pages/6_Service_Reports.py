@@ -207,7 +207,8 @@ with tab3:
                 title = st.text_input("Report Title", value=report["title"])
                 description = st.text_area("Description", value=report["description"], max_chars=1000)
                 actual_meter_reading = st.number_input("Actual Meter Reading", min_value=0, value=int(report.get("actual_meter_reading") if pd.notna(report.get("actual_meter_reading")) and report.get("actual_meter_reading") is not None else 0))
-                meter_unit = st.selectbox("Meter Unit", handler.get_meter_units(), index=handler.get_meter_units().index(report.get("meter_unit")) if report.get("meter_unit") in handler.get_meter_units() else 0)
+                meter_units = handler.get_meter_units()
+                meter_unit = st.selectbox("Meter Unit", meter_units, index=meter_units.index(report.get("meter_unit")) if report.get("meter_unit") in meter_units else 0)
                 completion_date = st.date_input(
                     "Completion Date",
                     value=pd.to_datetime(report["completion_date"])
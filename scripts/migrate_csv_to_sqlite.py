@@ -20,6 +20,10 @@ from utils.data_handler import DataHandler, DATA_DIR
 
 
 # Map CSV filename → (table name, primary key column)
+# executemany batch size: SQLite insert throughput saturates around 10k
+# rows per batch, and bounding the batch keeps the bind list small
+BATCH_ROWS = 10_000
+
 CSV_TABLE_MAP = {
     "objects.csv":      ("objects",      "object_id"),
     "services.csv":     ("services",     "service_id"),
@@ -37,34 +41,32 @@ def migrate_csv(conn: sqlite3.Connection, csv_path: Path, table: str, pk: str):
         return 0
 
     # keep_default_na=False preserves empty strings as "" rather than NaN so
-    # that empty text fields survive the migration correctly.
-    df = pd.read_csv(csv_path, keep_default_na=False)
-    if df.empty:
-        print(f"  Skipping {csv_path.name} – empty file.")
-        return 0
-
-    # Fetch existing primary keys to avoid duplicates
-    existing = {row[0] for row in conn.execute(f"SELECT {pk} FROM {table}").fetchall()}
-
+    # that empty text fields survive the migration correctly. chunksize
+    # streams the file, so peak memory stays at one batch no matter how
+    # large the legacy CSV grew.
+    #
+    # Each chunk goes through executemany on the connection passed in, so
+    # everything stays inside main()'s single BEGIN IMMEDIATE transaction
+    # (pandas' to_sql would commit behind our back after every call). The
+    # primary-key constraint plus INSERT OR IGNORE does the dedup inside
+    # SQLite, so no existing-key prefetch is needed at all.
     inserted = 0
-    for _, row in df.iterrows():
-        pk_val = row.get(pk)
-        if pk_val in existing:
-            continue
-        # Build INSERT with only the columns present in the CSV
-        cols = [c for c in df.columns if c in row.index]
-        placeholders = ", ".join("?" for _ in cols)
-        col_names = ", ".join(cols)
-        values = [None if pd.isna(row[c]) else row[c] for c in cols]
-        try:
-            conn.execute(
-                f"INSERT OR IGNORE INTO {table} ({col_names}) VALUES ({placeholders})",
-                values,
-            )
-            inserted += 1
-        except Exception as exc:
-            print(f"  Warning: could not insert row {pk_val}: {exc}")
-
+    try:
+        for chunk in pd.read_csv(csv_path, keep_default_na=False,
+                                 chunksize=BATCH_ROWS):
+            if chunk.empty:
+                continue
+            cols = ", ".join(chunk.columns)
+            placeholders = ", ".join("?" * len(chunk.columns))
+            inserted += conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({cols}) VALUES ({placeholders})",
+                chunk.where(pd.notna(chunk), None)
+                     .itertuples(index=False, name=None),
+            ).rowcount
+    except pd.errors.EmptyDataError:
+        print(f"  Skipping {csv_path.name} – empty file.")
+    except Exception as exc:
+        print(f"  Warning: batch insert into {table} failed: {exc}")
     return inserted
 
 
@@ -74,13 +76,38 @@ def main():
 
     # Initialise the database (creates tables if needed)
     handler = DataHandler()
-
-    with handler._get_conn() as conn:
-        for csv_name, (table, pk) in CSV_TABLE_MAP.items():
-            csv_path = DATA_DIR / csv_name
-            count = migrate_csv(conn, csv_path, table, pk)
-            if count:
-                print(f"  {csv_name}: {count} row(s) imported into '{table}'.")
+    # Drop the connections _initialize_db left cached: SQLite refuses to
+    # leave WAL mode while any other connection to the database exists,
+    # so the journal_mode toggle below needs the migration connection to
+    # be the only one.
+    handler.close()
+
+    conn = handler._get_conn()
+    try:
+        # Bulk-load settings: the journal lives in memory and SQLite stops
+        # fsyncing per transaction. A crash mid-migration can corrupt the
+        # database, which is acceptable here because this is a one-shot
+        # import that can simply be re-run against the CSVs.
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for csv_name, (table, pk) in CSV_TABLE_MAP.items():
+                csv_path = DATA_DIR / csv_name
+                count = migrate_csv(conn, csv_path, table, pk)
+                if count:
+                    print(f"  {csv_name}: {count} row(s) imported into '{table}'.")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            # Back to the durable settings the app runs with
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        handler.close()
 
     print("=" * 40)
     print("Migration complete.  The SQLite database is at:")
@@ -20,16 +20,31 @@ from utils.data_handler import DataHandler
 def main():
     handler = DataHandler()
     with handler._get_conn() as conn:
-        rows = conn.execute("SELECT object_id, object_type FROM objects").fetchall()
+        # Normalising per distinct value instead of per row: the table may
+        # hold thousands of rows but only a handful of spellings.
+        distinct = [r[0] for r in
+                    conn.execute("SELECT DISTINCT object_type FROM objects")]
+        type_map = [(raw, handler.normalize_object_type(raw))
+                    for raw in distinct]
+        bad = [(raw, canon) for raw, canon in type_map if canon != raw]
+
         changes = 0
-        for object_id, raw_type in rows:
-            canonical = handler.normalize_object_type(raw_type)
-            if raw_type != canonical:
-                conn.execute(
-                    "UPDATE objects SET object_type = ? WHERE object_id = ?",
-                    (canonical, object_id),
-                )
-                changes += 1
+        if bad:
+            # A temporary index turns the WHERE ... IN filter into index
+            # seeks, so reruns cost O(rows that still need fixing) rather
+            # than a full table scan. Dropped afterwards – the app never
+            # queries by raw object_type, so it would only slow writes.
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_obj_type_tmp "
+                         "ON objects(object_type)")
+            try:
+                for raw, canon in bad:
+                    changes += conn.execute(
+                        "UPDATE objects SET object_type = ? "
+                        "WHERE object_type = ?",
+                        (canon, raw),
+                    ).rowcount
+            finally:
+                conn.execute("DROP INDEX IF EXISTS idx_obj_type_tmp")
     print(f"Migration complete. {changes} record(s) updated.")
 
 
@@ -15,6 +15,7 @@ Usage:
 
 import sys
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Allow running from the project root
@@ -34,30 +35,37 @@ def main():
     print("=" * 50)
 
     handler = DataHandler()
-    df = handler.get_fault_reports()
+    # Plain dict rows – this script only iterates, so the DataFrame
+    # round-trip of get_fault_reports() buys nothing here
+    fault_rows = handler.get_fault_reports_rows()
 
-    if df.empty:
+    if not fault_rows:
         print("No fault reports found – nothing to migrate.")
         return
 
     total_migrated = 0
+    done = []
     project_root = Path(__file__).parent.parent
 
-    for _, row in df.iterrows():
+    # One aggregate query up front replaces a SELECT per fault report;
+    # membership is then a local set lookup inside the loop
+    with handler._get_conn() as conn:
+        already = {r[0] for r in
+                   conn.execute("SELECT DISTINCT fault_id FROM fault_photos")}
+
+    for row in fault_rows:
         fault_id = row["fault_id"]
-        photo_paths_val = str(row.get("photo_paths", "")) if row.get("photo_paths") else ""
-        photo_paths = [p for p in photo_paths_val.split(";") if p and p.lower() != "nan"]
+        photo_paths = DataHandler._parse_photo_paths(row["photo_paths"])
 
         if not photo_paths:
             continue
 
         # Skip if photos already migrated for this fault report
-        existing = handler.get_fault_photos(fault_id)
-        if existing:
-            print(f"  {fault_id}: {len(existing)} photo(s) already in DB – skipping.")
+        if fault_id in already:
+            print(f"  {fault_id}: photo(s) already in DB – skipping.")
             continue
 
-        migrated = 0
+        paths = []
         for path_str in photo_paths:
             photo_path = Path(path_str)
             if not photo_path.exists():
@@ -66,18 +74,34 @@ def main():
             if not photo_path.exists():
                 print(f"  {fault_id}: photo not found at '{path_str}' – skipping file.")
                 continue
+            paths.append(photo_path)
 
-            data = photo_path.read_bytes()
-            mime_type = guess_mime_type(photo_path.name)
-            handler.save_fault_photo(fault_id, photo_path.name, mime_type, data)
-            migrated += 1
-            total_migrated += 1
+        # Read the files concurrently (reads are latency-bound and need no
+        # ordering), then insert in one transaction per fault report
+        migrated = 0
+        if paths:
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                blobs = list(ex.map(Path.read_bytes, paths))
+            items = [(p.name, guess_mime_type(p.name), data, None)
+                     for p, data in zip(paths, blobs)]
+            handler.save_fault_photos_bulk(fault_id, items)
+            migrated = len(items)
+            total_migrated += migrated
 
         if migrated > 0:
-            # Clear photo_paths now that photos are stored in SQLite
-            handler.update_fault_report(fault_id, photo_paths="")
+            done.append(fault_id)
             print(f"  {fault_id}: {migrated} photo(s) migrated.")
 
+    if done:
+        # Clear photo_paths for every migrated fault in one statement
+        # instead of a per-fault UPDATE transaction
+        with handler._get_conn() as conn:
+            conn.execute(
+                "UPDATE fault_reports SET photo_paths = '' "
+                f"WHERE fault_id IN ({','.join('?' * len(done))})",
+                done,
+            )
+
     print("=" * 50)
     if total_migrated:
         print(f"Migration complete: {total_migrated} photo(s) moved to SQLite.")
@@ -4,18 +4,47 @@ import pandas as pd
 
 
 def selectbox_label(record_id, df, id_col, name_col=None, desc_col=None):
-    """Return 'id - name' for selectboxes; fall back to first 4 words of description."""
+    """Return 'id - name' for selectboxes; fall back to first 4 words of description.
+
+    Scans the frame per call; for selectboxes with many options prefer
+    selectbox_label_map, which builds all labels in one pass.
+    """
     rows = df[df[id_col] == record_id]
     if rows.empty:
         return str(record_id)
     row = rows.iloc[0]
+    return _format_label(record_id, row.get(name_col) if name_col else None,
+                         row.get(desc_col) if desc_col else None)
+
+
+def selectbox_label_map(df, id_col, name_col=None, desc_col=None):
+    """Build {record_id: label} for a whole frame in a single pass.
+
+    Labels match selectbox_label. A selectbox format_func is called once
+    per option, so looking labels up in this dict keeps rendering O(N)
+    instead of O(N²).
+    """
+    labels = {}
+    cols = [id_col]
     if name_col:
-        name = str(row.get(name_col, '') or '').strip()
+        cols.append(name_col)
+    if desc_col:
+        cols.append(desc_col)
+    for row in df[cols].itertuples(index=False):
+        record_id = row[0]
+        name = row[1] if name_col else None
+        desc = row[-1] if desc_col else None
+        labels[record_id] = _format_label(record_id, name, desc)
+    return labels
+
+
+def _format_label(record_id, name, desc):
+    if name is not None and not pd.isna(name):
+        name = str(name).strip()
         if name:
             return f"{record_id} - {name}"
-    if desc_col:
-        desc = str(row.get(desc_col, '') or '').strip()
-        words = ' '.join(desc.split()[:4])
+    if desc is not None and not pd.isna(desc):
+        words = ' '.join(str(desc).split()[:4])
         if words:
             return f"{record_id} - {words}"
     return str(record_id)
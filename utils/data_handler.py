@@ -7,6 +7,9 @@ previously accessed private CSV internals and now use dedicated methods:
   - delete_user_data()     (replaces the CSV loop in Admin Panel page)
 """
 
+import functools
+import threading
+from contextlib import contextmanager
 import pandas as pd
 import sqlite3
 from pathlib import Path
@@ -107,47 +110,78 @@ CREATE TABLE IF NOT EXISTS fault_reports (
     user_email           TEXT
 );
 CREATE TABLE IF NOT EXISTS fault_photos (
-    photo_id  TEXT PRIMARY KEY,
-    fault_id  TEXT NOT NULL,
-    filename  TEXT,
-    mime_type TEXT DEFAULT 'image/jpeg',
-    data      BLOB NOT NULL,
+    photo_id   TEXT PRIMARY KEY,
+    fault_id   TEXT NOT NULL,
+    filename   TEXT,
+    mime_type  TEXT DEFAULT 'image/jpeg',
+    data       BLOB NOT NULL,
+    thumb_data BLOB,
     FOREIGN KEY (fault_id) REFERENCES fault_reports(fault_id) ON DELETE CASCADE
 );
 CREATE TABLE IF NOT EXISTS meter_units (
     unit TEXT PRIMARY KEY
 );
+CREATE TABLE IF NOT EXISTS id_counters (
+    name     TEXT PRIMARY KEY,
+    next_val INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fault_user_type ON fault_reports(user_email, object_type, fault_id);
+CREATE INDEX IF NOT EXISTS idx_fault_photo_fid ON fault_photos(fault_id);
+-- Filter columns used by the get_* methods; without these every filtered
+-- read is a full-table scan.
+CREATE INDEX IF NOT EXISTS idx_objects_type_user    ON objects(object_type, user_email);
+CREATE INDEX IF NOT EXISTS idx_objects_user         ON objects(user_email);
+CREATE INDEX IF NOT EXISTS idx_services_obj         ON services(object_id);
+CREATE INDEX IF NOT EXISTS idx_services_user        ON services(user_email);
+CREATE INDEX IF NOT EXISTS idx_reminders_status_date ON reminders(status, reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_due        ON reminders(email_sent, status, email_notification, reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_user       ON reminders(user_email);
+CREATE INDEX IF NOT EXISTS idx_reports_obj          ON reports(object_id, object_type);
+CREATE INDEX IF NOT EXISTS idx_reports_user         ON reports(user_email);
+CREATE INDEX IF NOT EXISTS idx_faults_obj_user      ON fault_reports(object_id, user_email);
 """
 
-# Valid columns per table – used to silently ignore unknown kwargs in
-# update_* methods (same protection the original code had via `if key in df.columns`).
+# Columns per table in schema order – used for explicit SELECT lists (so
+# renamed or future columns never travel by accident) and, via the derived
+# frozensets below, to silently ignore unknown kwargs in update_* methods
+# (same protection the original code had via `if key in df.columns`).
 _TABLE_COLUMNS = {
-    "objects": frozenset([
+    "objects": (
         "object_id", "object_type", "name", "description",
         "status", "created_date", "last_updated", "user_email",
-    ]),
-    "services": frozenset([
+    ),
+    "services": (
         "service_id", "object_id", "object_type", "service_name",
         "description", "interval_days", "last_service_date",
         "next_service_date", "status", "notes", "created_date",
         "expected_meter_reading", "meter_unit", "user_email",
-    ]),
-    "reminders": frozenset([
+    ),
+    "reminders": (
         "reminder_id", "service_id", "object_id", "object_type",
         "reminder_date", "status", "notes", "created_date",
         "user_email", "email_notification", "notification_time", "email_sent",
-    ]),
-    "reports": frozenset([
+    ),
+    "reports": (
         "report_id", "object_id", "object_type", "report_type",
         "title", "description", "completion_date", "notes",
         "created_date", "actual_meter_reading", "meter_unit", "user_email",
-    ]),
-    "fault_reports": frozenset([
+    ),
+    "fault_reports": (
         "fault_id", "object_id", "object_type", "observation_date",
         "actual_meter_reading", "meter_unit", "description",
         "photo_paths", "created_date", "user_email",
-    ]),
+    ),
 }
+_TABLE_COLUMN_SETS = {table: frozenset(cols) for table, cols in _TABLE_COLUMNS.items()}
+
+# pyarrow-backed frames serialize to Streamlit's Arrow wire format without
+# the object-dtype conversion pass; fall back to numpy dtypes when pyarrow
+# isn't installed.
+try:
+    import pyarrow  # noqa: F401
+    _READ_SQL_KWARGS = {"dtype_backend": "pyarrow"}
+except ImportError:
+    _READ_SQL_KWARGS = {}
 
 
 class DataHandler:
@@ -169,54 +203,253 @@ class DataHandler:
 
     def __init__(self, db_path=None):
         self._db_path = db_path or str(DB_PATH)
+        self._tls = threading.local()
+        self._write_lock = threading.Lock()
+        self._write_conn = None
         self._initialize_db()
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    # Applied in one executescript round trip per new connection instead
+    # of seven execute calls:
+    #  - busy_timeout: wait instead of raising SQLITE_BUSY when another
+    #    connection holds the write lock
+    #  - cache_size: 20 MB page cache (negative = KB) so repeated SELECTs
+    #    serve from memory instead of re-reading pages
+    #  - temp_store: sorts and temp B-trees (ORDER BY, DISTINCT) stay in
+    #    memory
+    #  - mmap_size: up to 256 MB of the DB file is memory-mapped, turning
+    #    page reads into page faults instead of read() syscalls
+    _PRAGMA_SCRIPT = (
+        "PRAGMA journal_mode = WAL;"
+        "PRAGMA synchronous  = NORMAL;"
+        "PRAGMA foreign_keys = ON;"
+        "PRAGMA busy_timeout = 5000;"
+        "PRAGMA cache_size = -20000;"
+        "PRAGMA temp_store = MEMORY;"
+        "PRAGMA mmap_size = 268435456;"
+    )
+
+    def _open_conn(self):
+        """Open and configure a new connection (PRAGMAs run once here)."""
+        conn = sqlite3.connect(self._db_path, timeout=30,
+                               check_same_thread=False)
+        conn.executescript(self._PRAGMA_SCRIPT)
+        return conn
+
     def _get_conn(self):
-        """Open a connection with WAL mode for safe concurrent access.
+        """Return this thread's cached read-write connection.
 
-        check_same_thread=False is required because Streamlit may call
-        DataHandler methods from a different thread than the one that
-        constructed the object.  Each method call creates its own
-        connection (opened and closed via the context manager), so no
-        single Connection object is ever shared between threads.
+        Opening a connection costs several syscalls (open + WAL/SHM mmap)
+        plus parsing the PRAGMAs, which used to be paid on every method
+        call.  The connection is cached in threading.local() storage so
+        each thread reuses its own Connection and no Connection object is
+        ever shared between threads – Streamlit may call DataHandler
+        methods from a different thread than the one that constructed the
+        object.  Callers use ``with self._get_conn() as conn:`` purely as
+        a transaction block; it commits/rolls back without closing.
+
+        The app itself goes through _read()/_write(); this remains for
+        the migration scripts, which need one connection with both roles.
         """
-        conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
-        conn.execute("PRAGMA journal_mode = WAL")
-        conn.execute("PRAGMA synchronous  = NORMAL")
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = self._open_conn()
+            self._tls.conn = conn
         return conn
 
+    @contextmanager
+    def _read(self):
+        """Yield this thread's read-only connection.
+
+        Readers are per-thread and opened with query_only=ON, so under
+        WAL they run concurrently with each other and with the writer –
+        a long SELECT never sits on the write lock, and a stray write
+        through a read path fails loudly instead of serialising.
+        """
+        conn = getattr(self._tls, "read_conn", None)
+        if conn is None:
+            conn = self._open_conn()
+            conn.execute("PRAGMA query_only = ON")
+            self._tls.read_conn = conn
+        yield conn
+
+    @contextmanager
+    def _write(self):
+        """Yield the single write connection, locked and in a transaction.
+
+        SQLite allows one writer at a time anyway; funnelling all writes
+        through one mutex-guarded connection means contention is resolved
+        in-process by the lock instead of via busy_timeout polling on the
+        database file.  Commits on success, rolls back on exception.
+
+        The transaction is opened with BEGIN IMMEDIATE: the write lock is
+        taken up front instead of on the first INSERT/UPDATE, so a
+        deferred read-to-write lock upgrade can never race another writer
+        into SQLITE_BUSY.  It also makes read-then-write sequences such
+        as the MAX(id)+INSERT in the add_* methods atomic.
+        """
+        with self._write_lock:
+            if self._write_conn is None:
+                conn = self._open_conn()
+                # autocommit mode – transactions are controlled explicitly
+                conn.isolation_level = None
+                self._write_conn = conn
+            conn = self._write_conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                # executescript (schema init) commits implicitly, so the
+                # transaction may already be closed
+                if conn.in_transaction:
+                    conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """Close the calling thread's cached connections and the shared writer."""
+        for attr in ("conn", "read_conn"):
+            conn = getattr(self._tls, attr, None)
+            if conn is not None:
+                conn.close()
+                setattr(self._tls, attr, None)
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
+
     def _initialize_db(self):
         """Create tables and seed meter_units on first run."""
-        with self._get_conn() as conn:
+        with self._write() as conn:
+            # Detect first run before the CREATE IF NOT EXISTS script masks it
+            fresh_db = not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'objects'"
+            ).fetchone()
             conn.executescript(_SCHEMA)
+            # Databases created before thumbnails were stored lack the
+            # thumb_data column – add it in place.
+            photo_cols = {r[1] for r in conn.execute("PRAGMA table_info(fault_photos)")}
+            if "thumb_data" not in photo_cols:
+                conn.execute("ALTER TABLE fault_photos ADD COLUMN thumb_data BLOB")
             if not conn.execute("SELECT 1 FROM meter_units LIMIT 1").fetchone():
                 conn.executemany(
                     "INSERT OR IGNORE INTO meter_units (unit) VALUES (?)",
                     [("km",), ("kWh",)],
                 )
+            # Seed planner statistics once when the schema is first created;
+            # after that PRAGMA optimize re-analyzes only tables whose stats
+            # have gone stale. A full ANALYZE here ran inside the write lock
+            # on every DataHandler construction, i.e. on every page rerun.
+            if fresh_db:
+                conn.execute("ANALYZE")
+            else:
+                conn.execute("PRAGMA optimize")
 
     @staticmethod
     def _where(clauses):
         return ("WHERE " + " AND ".join(clauses)) if clauses else ""
 
+    @staticmethod
+    def _next_id(conn, counter, seed_sql, seed_params=(), count=1):
+        """Allocate *count* sequential ID numbers for *counter*, returning the first.
+
+        A single UPDATE ... RETURNING on the id_counters row replaces the
+        old MAX(CAST(SUBSTR(id, 5) AS INTEGER)) scan, which cost O(rows)
+        per insert because the CAST defeats any index.  Counters are
+        seeded lazily: the first allocation for a counter runs the legacy
+        MAX scan (*seed_sql*) once and records the result, so existing
+        databases pick up exactly where their IDs left off.  Must be
+        called inside a _write() transaction.  Requires SQLite >= 3.35
+        for RETURNING.
+        """
+        row = conn.execute(
+            "UPDATE id_counters SET next_val = next_val + ? "
+            "WHERE name = ? RETURNING next_val",
+            (count, counter),
+        ).fetchone()
+        if row is not None:
+            return row[0] - count + 1
+        seed = conn.execute(seed_sql, seed_params).fetchone()[0] or 0
+        conn.execute(
+            "INSERT INTO id_counters (name, next_val) VALUES (?, ?)",
+            (counter, seed + count),
+        )
+        return seed + 1
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _update_sql(table, id_col, keys, guard_keys):
+        """Build 'UPDATE ... SET k = ? ... WHERE id = ?' for a key tuple.
+
+        The UI updates the same few column combinations over and over;
+        caching means each (table, key-set) is assembled once, and since
+        the identical SQL text reaches conn.execute every time, sqlite3's
+        per-connection statement cache reuses the compiled statement
+        instead of re-parsing it.  Keys are validated against
+        _TABLE_COLUMN_SETS by the callers before they get here.
+
+        *guard_keys* adds an AND (k IS NOT ? OR ...) clause so a save
+        that changes nothing skips the row write entirely – no WAL
+        append, no fsync – and reports False.  Callers append the
+        guarded values again after the id parameter.  IS NOT (rather
+        than !=) keeps NULL transitions honest.
+        """
+        sets = ", ".join(f"{k} = ?" for k in keys)
+        sql = f"UPDATE {table} SET {sets} WHERE {id_col} = ?"
+        if guard_keys:
+            sql += " AND (" + " OR ".join(f"{k} IS NOT ?" for k in guard_keys) + ")"
+        # RETURNING 1 reports the hit inline, replacing the cur.rowcount
+        # inspection (SQLite >= 3.35)
+        return sql + " RETURNING 1"
+
+    _STREAM_CHUNK_ROWS = 5000
+
+    def _stream_query(self, sql, params, parse_dates=None):
+        """Yield _norm_df-processed DataFrame chunks for a large query.
+
+        Backs the stream=True getters: memory stays O(chunk) instead of
+        O(result), and the first chunk is available as soon as it is
+        fetched rather than after the full scan materialises.
+        """
+        with self._read() as conn:
+            for chunk in pd.read_sql_query(sql, conn, params=params,
+                                           parse_dates=parse_dates,
+                                           chunksize=self._STREAM_CHUNK_ROWS,
+                                           **_READ_SQL_KWARGS):
+                yield self._norm_df(chunk)
+
     def _norm_df(self, df):
-        """Return a copy of *df* with object_type column normalised."""
+        """Return a copy of *df* with object_type column normalised.
+
+        Vectorised equivalent of mapping normalize_object_type over the
+        column: strip/lower run as C string ops and the canon lookup is
+        one .map call, instead of a Python call per row.  Nulls pass
+        through untouched.
+        """
         if "object_type" in df.columns and not df.empty:
             df = df.copy()
-            df["object_type"] = df["object_type"].apply(self.normalize_object_type)
+            s = df["object_type"].astype("string").str.strip()
+            df["object_type"] = s.str.lower().map(self._OBJECT_TYPE_CANON).fillna(s)
         return df
 
-    def normalize_object_type(self, value):
-        """Normalise a raw object_type value to its canonical form."""
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def normalize_object_type(value):
+        """Normalise a raw object_type value to its canonical form.
+
+        Cached – the universe of raw spellings is a handful of strings,
+        so after warm-up each scalar call is a dict hit instead of a
+        strip/lower round trip.  (_norm_df normalises whole columns
+        vectorised and does not come through here.)
+        """
         if value is None:
             return value
         v = str(value).strip()
-        return self._OBJECT_TYPE_CANON.get(v.lower(), v)
+        return DataHandler._OBJECT_TYPE_CANON.get(v.lower(), v)
 
     # ------------------------------------------------------------------
     # Objects
@@ -232,8 +465,9 @@ class DataHandler:
             clauses.append("user_email = ?")
             params.append(user_email)
         sql = f"SELECT * FROM objects {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
+        with self._read() as conn:
+            df = pd.read_sql_query(sql, conn, params=params,
+                                   **_READ_SQL_KWARGS)
         return self._norm_df(df)
 
     def add_object(self, object_type, name, description="", status="Active", user_email=None):
@@ -241,46 +475,81 @@ class DataHandler:
         object_type = self.normalize_object_type(object_type)
         prefix = str(object_type)[:3].upper()
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with self._get_conn() as conn:
-            row = conn.execute(
+        with self._write() as conn:
+            num = self._next_id(
+                conn, f"objects:{object_type}",
                 "SELECT MAX(CAST(SUBSTR(object_id, 5) AS INTEGER)) "
                 "FROM objects WHERE object_type = ?",
                 (object_type,),
-            ).fetchone()
-            object_id = f"{prefix}-{(row[0] or 0) + 1:04d}"
+            )
+            object_id = f"{prefix}-{num:04d}"
             conn.execute(
                 "INSERT INTO objects VALUES (?,?,?,?,?,?,?,?)",
                 (object_id, object_type, name, description, status, now, now, user_email),
             )
         return object_id
 
+    def add_objects_bulk(self, rows):
+        """Insert several objects in one transaction.
+
+        *rows* is an iterable of dicts taking the same keys as
+        add_object() arguments (object_type and name required).  Returns
+        the list of new object_ids.  N rows cost one commit instead of N.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._write() as conn:
+            object_ids, params = [], []
+            for r in rows:
+                object_type = self.normalize_object_type(r["object_type"])
+                num = self._next_id(
+                    conn, f"objects:{object_type}",
+                    "SELECT MAX(CAST(SUBSTR(object_id, 5) AS INTEGER)) "
+                    "FROM objects WHERE object_type = ?",
+                    (object_type,),
+                )
+                object_id = f"{str(object_type)[:3].upper()}-{num:04d}"
+                object_ids.append(object_id)
+                params.append((object_id, object_type, r["name"],
+                               r.get("description", ""), r.get("status", "Active"),
+                               now, now, r.get("user_email")))
+            conn.executemany("INSERT INTO objects VALUES (?,?,?,?,?,?,?,?)", params)
+        return object_ids
+
     def update_object(self, object_id, **kwargs):
         """Update an object."""
         # Column names are validated against the known-column frozenset before
         # being interpolated into SQL, so f-string interpolation is safe here.
-        valid = _TABLE_COLUMNS["objects"]
-        sets, params = [], []
-        for key, value in kwargs.items():
+        valid = _TABLE_COLUMN_SETS["objects"]
+        keys, params = [], []
+        # sorted so the same column set always yields the same cached SQL
+        for key, value in sorted(kwargs.items()):
             if key not in valid:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
-            sets.append(f"{key} = ?")
+            keys.append(key)
             params.append(value)
-        if not sets:
+        if not keys:
             return False
-        sets.append("last_updated = ?")
+        guard_keys, guard_params = tuple(keys), list(params)
+        keys.append("last_updated")
         params.append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         params.append(object_id)
-        with self._get_conn() as conn:
+        params.extend(guard_params)
+        with self._write() as conn:
             cur = conn.execute(
-                f"UPDATE objects SET {', '.join(sets)} WHERE object_id = ?", params
+                self._update_sql("objects", "object_id", tuple(keys), guard_keys),
+                params,
             )
-        return cur.rowcount > 0
+            updated = cur.fetchone() is not None
+        return updated
 
     def delete_object(self, object_id):
         """Delete an object."""
-        with self._get_conn() as conn:
+        with self._write() as conn:
             conn.execute("DELETE FROM objects WHERE object_id = ?", (object_id,))
 
     # ------------------------------------------------------------------
@@ -300,8 +569,9 @@ class DataHandler:
             clauses.append("user_email = ?")
             params.append(user_email)
         sql = f"SELECT * FROM services {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
+        with self._read() as conn:
+            df = pd.read_sql_query(sql, conn, params=params,
+                                   **_READ_SQL_KWARGS)
         return self._norm_df(df)
 
     def add_service(self, object_id, object_type, service_name, interval_days,
@@ -311,11 +581,12 @@ class DataHandler:
         object_type = self.normalize_object_type(object_type)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         today = datetime.now().strftime("%Y-%m-%d")
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT MAX(CAST(SUBSTR(service_id, 5) AS INTEGER)) FROM services"
-            ).fetchone()
-            service_id = f"SVC-{(row[0] or 0) + 1:05d}"
+        with self._write() as conn:
+            num = self._next_id(
+                conn, "services",
+                "SELECT MAX(CAST(SUBSTR(service_id, 5) AS INTEGER)) FROM services",
+            )
+            service_id = f"SVC-{num:05d}"
             conn.execute(
                 "INSERT INTO services VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
                 (service_id, object_id, object_type, service_name, description,
@@ -324,29 +595,66 @@ class DataHandler:
             )
         return service_id
 
+    def add_services_bulk(self, rows):
+        """Insert several services in one transaction.
+
+        *rows* is an iterable of dicts taking the same keys as
+        add_service() arguments.  Returns the list of new service_ids.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        today = datetime.now().strftime("%Y-%m-%d")
+        with self._write() as conn:
+            first = self._next_id(
+                conn, "services",
+                "SELECT MAX(CAST(SUBSTR(service_id, 5) AS INTEGER)) FROM services",
+                count=len(rows),
+            )
+            service_ids, params = [], []
+            for i, r in enumerate(rows):
+                service_id = f"SVC-{first + i:05d}"
+                service_ids.append(service_id)
+                params.append((service_id, r["object_id"],
+                               self.normalize_object_type(r["object_type"]),
+                               r["service_name"], r.get("description", ""),
+                               r["interval_days"], None, today,
+                               r.get("status", "Scheduled"), r.get("notes", ""),
+                               now, r.get("expected_meter_reading"),
+                               r.get("meter_unit"), r.get("user_email")))
+            conn.executemany(
+                "INSERT INTO services VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)", params
+            )
+        return service_ids
+
     def update_service(self, service_id, **kwargs):
         """Update a service."""
-        valid = _TABLE_COLUMNS["services"]
-        sets, params = [], []
-        for key, value in kwargs.items():
+        valid = _TABLE_COLUMN_SETS["services"]
+        keys, params = [], []
+        # sorted so the same column set always yields the same cached SQL
+        for key, value in sorted(kwargs.items()):
             if key not in valid:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
-            sets.append(f"{key} = ?")
+            keys.append(key)
             params.append(value)
-        if not sets:
+        if not keys:
             return False
         params.append(service_id)
-        with self._get_conn() as conn:
+        params.extend(params[:len(keys)])
+        with self._write() as conn:
             cur = conn.execute(
-                f"UPDATE services SET {', '.join(sets)} WHERE service_id = ?", params
+                self._update_sql("services", "service_id", tuple(keys), tuple(keys)),
+                params,
             )
-        return cur.rowcount > 0
+            updated = cur.fetchone() is not None
+        return updated
 
     def delete_service(self, service_id):
         """Delete a service."""
-        with self._get_conn() as conn:
+        with self._write() as conn:
             conn.execute("DELETE FROM services WHERE service_id = ?", (service_id,))
 
     # ------------------------------------------------------------------
@@ -354,10 +662,17 @@ class DataHandler:
     # ------------------------------------------------------------------
 
     def get_meter_units(self):
-        """Return list of configured meter units."""
-        with self._get_conn() as conn:
-            rows = conn.execute("SELECT unit FROM meter_units ORDER BY unit").fetchall()
-        return [r[0] for r in rows]
+        """Return list of configured meter units.
+
+        Iterates the cursor directly into the result list – fetchall()
+        would materialise an intermediate tuple list first.  ORDER BY
+        unit is satisfied by the primary-key B-tree, so there is no sort
+        step either.  Called on every page render, hence the attention.
+        """
+        with self._read() as conn:
+            cur = conn.execute("SELECT unit FROM meter_units ORDER BY unit")
+            cur.row_factory = sqlite3.Row
+            return [r["unit"] for r in cur]
 
     def add_meter_unit(self, unit):
         """Add a new meter unit if not present."""
@@ -365,7 +680,7 @@ class DataHandler:
         if not unit:
             return False
         try:
-            with self._get_conn() as conn:
+            with self._write() as conn:
                 conn.execute("INSERT INTO meter_units (unit) VALUES (?)", (unit,))
             return True
         except sqlite3.IntegrityError:
@@ -373,9 +688,12 @@ class DataHandler:
 
     def delete_meter_unit(self, unit):
         """Delete a meter unit if it exists."""
-        with self._get_conn() as conn:
-            cur = conn.execute("DELETE FROM meter_units WHERE unit = ?", (unit,))
-        return cur.rowcount > 0
+        with self._write() as conn:
+            cur = conn.execute(
+                "DELETE FROM meter_units WHERE unit = ? RETURNING 1", (unit,)
+            )
+            deleted = cur.fetchone() is not None
+        return deleted
 
     # ------------------------------------------------------------------
     # Reminders
@@ -398,20 +716,31 @@ class DataHandler:
             clauses.append("user_email = ?")
             params.append(user_email)
         sql = f"SELECT * FROM reminders {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
-        return self._norm_df(df)
+        with self._read() as conn:
+            # Parse dates once here so pages get datetime64 columns instead
+            # of re-parsing strings on every rerun
+            df = pd.read_sql_query(sql, conn, params=params,
+                                   parse_dates=["reminder_date"],
+                                   **_READ_SQL_KWARGS)
+        df = self._norm_df(df)
+        # Low-cardinality string columns as categoricals, matching
+        # get_fault_reports: filters compare integer codes and the rows
+        # shrink accordingly.
+        for col in ("object_type", "status"):
+            df[col] = df[col].astype("category")
+        return df
 
     def add_reminder(self, service_id, object_id, object_type, reminder_date, notes="",
                      user_email=None, email_notification=False, notification_time="09:00"):
         """Add a new reminder."""
         object_type = self.normalize_object_type(object_type)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT MAX(CAST(SUBSTR(reminder_id, 5) AS INTEGER)) FROM reminders"
-            ).fetchone()
-            reminder_id = f"REM-{(row[0] or 0) + 1:05d}"
+        with self._write() as conn:
+            num = self._next_id(
+                conn, "reminders",
+                "SELECT MAX(CAST(SUBSTR(reminder_id, 5) AS INTEGER)) FROM reminders",
+            )
+            reminder_id = f"REM-{num:05d}"
             conn.execute(
                 "INSERT INTO reminders VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
                 (reminder_id, service_id, object_id, object_type, reminder_date,
@@ -422,38 +751,85 @@ class DataHandler:
 
     def update_reminder(self, reminder_id, **kwargs):
         """Update a reminder."""
-        valid = _TABLE_COLUMNS["reminders"]
-        sets, params = [], []
-        for key, value in kwargs.items():
+        valid = _TABLE_COLUMN_SETS["reminders"]
+        keys, params = [], []
+        # sorted so the same column set always yields the same cached SQL
+        for key, value in sorted(kwargs.items()):
             if key not in valid:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
-            sets.append(f"{key} = ?")
+            keys.append(key)
             params.append(value)
-        if not sets:
+        if not keys:
             return False
         params.append(reminder_id)
-        with self._get_conn() as conn:
+        params.extend(params[:len(keys)])
+        with self._write() as conn:
             cur = conn.execute(
-                f"UPDATE reminders SET {', '.join(sets)} WHERE reminder_id = ?", params
+                self._update_sql("reminders", "reminder_id", tuple(keys), tuple(keys)),
+                params,
             )
-        return cur.rowcount > 0
+            updated = cur.fetchone() is not None
+        return updated
+
+    def get_due_email_reminders(self, today):
+        """Return dict rows for reminders whose email should go out now.
+
+        Pushes the whole eligibility predicate (pending, email wanted,
+        not yet sent, due on or before *today*) into SQL over
+        idx_reminders_due, so only the handful of actionable rows cross
+        into Python instead of the notifier filtering the full table row
+        by row.  *today* is an ISO date string – the TEXT dates compare
+        correctly lexicographically.
+        """
+        with self._read() as conn:
+            cur = conn.execute(
+                "SELECT * FROM reminders WHERE email_sent = 0 "
+                "AND status = 'Pending' AND email_notification = 1 "
+                "AND reminder_date <= ?",
+                (today,),
+            )
+            cur.row_factory = sqlite3.Row
+            return [dict(r) for r in cur]
+
+    def mark_reminders_email_sent(self, reminder_ids):
+        """Set email_sent on several reminders in one transaction.
+
+        Used by EmailNotifier after a send run – one commit for the whole
+        batch instead of one per reminder.  Returns the number updated.
+        """
+        reminder_ids = [(rid,) for rid in reminder_ids]
+        if not reminder_ids:
+            return 0
+        with self._write() as conn:
+            cur = conn.executemany(
+                "UPDATE reminders SET email_sent = 1 WHERE reminder_id = ?",
+                reminder_ids,
+            )
+        return cur.rowcount
 
     def delete_reminder(self, reminder_id):
         """Delete a reminder."""
-        with self._get_conn() as conn:
+        with self._write() as conn:
             cur = conn.execute(
-                "DELETE FROM reminders WHERE reminder_id = ?", (reminder_id,)
+                "DELETE FROM reminders WHERE reminder_id = ? RETURNING 1",
+                (reminder_id,),
             )
-        return cur.rowcount > 0
+            deleted = cur.fetchone() is not None
+        return deleted
 
     # ------------------------------------------------------------------
     # Reports
     # ------------------------------------------------------------------
 
-    def get_reports(self, object_type=None, object_id=None, user_email=None, is_admin=False):
-        """Get reports filtered by criteria and user."""
+    def get_reports(self, object_type=None, object_id=None, user_email=None,
+                    is_admin=False, stream=False):
+        """Get reports filtered by criteria and user.
+
+        With stream=True, returns a generator of DataFrame chunks
+        instead of one frame – see _stream_query().
+        """
         clauses, params = [], []
         if object_type:
             clauses.append("object_type = ?")
@@ -465,8 +841,11 @@ class DataHandler:
             clauses.append("user_email = ?")
             params.append(user_email)
         sql = f"SELECT * FROM reports {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
+        if stream:
+            return self._stream_query(sql, params)
+        with self._read() as conn:
+            df = pd.read_sql_query(sql, conn, params=params,
+                                   **_READ_SQL_KWARGS)
         return self._norm_df(df)
 
     def add_report(self, object_id, object_type, report_type, title,
@@ -475,11 +854,12 @@ class DataHandler:
         """Add a new report."""
         object_type = self.normalize_object_type(object_type)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT MAX(CAST(SUBSTR(report_id, 5) AS INTEGER)) FROM reports"
-            ).fetchone()
-            report_id = f"REP-{(row[0] or 0) + 1:05d}"
+        with self._write() as conn:
+            num = self._next_id(
+                conn, "reports",
+                "SELECT MAX(CAST(SUBSTR(report_id, 5) AS INTEGER)) FROM reports",
+            )
+            report_id = f"REP-{num:05d}"
             conn.execute(
                 "INSERT INTO reports VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
                 (report_id, object_id, object_type, report_type, title, description,
@@ -490,35 +870,49 @@ class DataHandler:
 
     def update_report(self, report_id, **kwargs):
         """Update a report."""
-        valid = _TABLE_COLUMNS["reports"]
-        sets, params = [], []
-        for key, value in kwargs.items():
+        valid = _TABLE_COLUMN_SETS["reports"]
+        keys, params = [], []
+        # sorted so the same column set always yields the same cached SQL
+        for key, value in sorted(kwargs.items()):
             if key not in valid:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
-            sets.append(f"{key} = ?")
+            keys.append(key)
             params.append(value)
-        if not sets:
+        if not keys:
             return False
         params.append(report_id)
-        with self._get_conn() as conn:
+        params.extend(params[:len(keys)])
+        with self._write() as conn:
             cur = conn.execute(
-                f"UPDATE reports SET {', '.join(sets)} WHERE report_id = ?", params
+                self._update_sql("reports", "report_id", tuple(keys), tuple(keys)),
+                params,
             )
-        return cur.rowcount > 0
+            updated = cur.fetchone() is not None
+        return updated
 
     def delete_report(self, report_id):
         """Delete a report."""
-        with self._get_conn() as conn:
-            cur = conn.execute("DELETE FROM reports WHERE report_id = ?", (report_id,))
-        return cur.rowcount > 0
+        with self._write() as conn:
+            cur = conn.execute(
+                "DELETE FROM reports WHERE report_id = ? RETURNING 1", (report_id,)
+            )
+            deleted = cur.fetchone() is not None
+        return deleted
 
     # ------------------------------------------------------------------
     # Fault reports
     # ------------------------------------------------------------------
 
-    def get_fault_reports(self, object_type=None, object_id=None, user_email=None, is_admin=False):
+    def get_fault_reports(self, object_type=None, object_id=None, user_email=None,
+                          is_admin=False, stream=False):
+        """Get fault reports filtered by criteria and user.
+
+        With stream=True, returns a generator of DataFrame chunks (no
+        categorical conversion – category codes would not line up
+        between chunks).
+        """
         clauses, params = [], []
         if object_type:
             clauses.append("object_type = ?")
@@ -530,20 +924,68 @@ class DataHandler:
             clauses.append("user_email = ?")
             params.append(user_email)
         sql = f"SELECT * FROM fault_reports {self._where(clauses)}"
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(sql, conn, params=params)
-        return self._norm_df(df)
+        if stream:
+            return self._stream_query(
+                sql, params, parse_dates=["observation_date", "created_date"]
+            )
+        with self._read() as conn:
+            # Parse date columns once here so consumers get datetime64
+            # values instead of re-parsing strings per row/rerun.
+            df = pd.read_sql_query(
+                sql, conn, params=params,
+                parse_dates=["observation_date", "created_date"],
+                **_READ_SQL_KWARGS,
+            )
+        df = self._norm_df(df)
+        # Low-cardinality string columns as categoricals: equality filters
+        # compare integer codes instead of Python strings, and memory per
+        # row drops accordingly.
+        for col in ("object_type", "meter_unit"):
+            df[col] = df[col].astype("category")
+        return df
+
+    def get_fault_reports_rows(self, object_type=None, object_id=None,
+                               user_email=None, is_admin=False):
+        """Like get_fault_reports but returns a list of plain dicts.
+
+        For callers that only iterate (migration scripts, counts) the
+        DataFrame construction in pd.read_sql_query is pure overhead –
+        every value is copied into numpy/arrow storage just to be read
+        back out row by row.  This path fetches sqlite3.Row objects and
+        normalises object_type inline.
+        """
+        clauses, params = [], []
+        if object_type:
+            clauses.append("object_type = ?")
+            params.append(self.normalize_object_type(object_type))
+        if object_id:
+            clauses.append("object_id = ?")
+            params.append(object_id)
+        if user_email and not is_admin:
+            clauses.append("user_email = ?")
+            params.append(user_email)
+        sql = f"SELECT * FROM fault_reports {self._where(clauses)}"
+        with self._read() as conn:
+            cur = conn.execute(sql, params)
+            cur.row_factory = sqlite3.Row
+            rows = []
+            for row in cur:
+                d = dict(row)
+                d["object_type"] = self.normalize_object_type(d["object_type"])
+                rows.append(d)
+        return rows
 
     def add_fault_report(self, object_id, object_type, observation_date,
                          actual_meter_reading, meter_unit, description,
                          photo_paths=None, user_email=None):
         object_type = self.normalize_object_type(object_type)
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT MAX(CAST(SUBSTR(fault_id, 5) AS INTEGER)) FROM fault_reports"
-            ).fetchone()
-            fault_id = f"FLT-{(row[0] or 0) + 1:05d}"
+        with self._write() as conn:
+            num = self._next_id(
+                conn, "fault_reports",
+                "SELECT MAX(CAST(SUBSTR(fault_id, 5) AS INTEGER)) FROM fault_reports",
+            )
+            fault_id = f"FLT-{num:05d}"
             conn.execute(
                 "INSERT INTO fault_reports VALUES (?,?,?,?,?,?,?,?,?,?)",
                 (fault_id, object_id, object_type, observation_date,
@@ -553,85 +995,233 @@ class DataHandler:
             )
         return fault_id
 
+    def add_fault_reports_bulk(self, rows):
+        """Insert several fault reports in one transaction.
+
+        *rows* is an iterable of dicts taking the same keys as
+        add_fault_report() arguments.  Returns the list of new fault_ids.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._write() as conn:
+            first = self._next_id(
+                conn, "fault_reports",
+                "SELECT MAX(CAST(SUBSTR(fault_id, 5) AS INTEGER)) FROM fault_reports",
+                count=len(rows),
+            )
+            fault_ids, params = [], []
+            for i, r in enumerate(rows):
+                fault_id = f"FLT-{first + i:05d}"
+                fault_ids.append(fault_id)
+                photo_paths = r.get("photo_paths")
+                params.append((fault_id, r["object_id"],
+                               self.normalize_object_type(r["object_type"]),
+                               r["observation_date"], r["actual_meter_reading"],
+                               r["meter_unit"], r["description"],
+                               ";".join(photo_paths) if photo_paths else "",
+                               now, r.get("user_email")))
+            conn.executemany(
+                "INSERT INTO fault_reports VALUES (?,?,?,?,?,?,?,?,?,?)", params
+            )
+        return fault_ids
+
     def update_fault_report(self, fault_id, **kwargs):
         """Update a fault report by fault_id. kwargs keys must match column names."""
-        valid = _TABLE_COLUMNS["fault_reports"]
-        sets, params = [], []
-        for key, value in kwargs.items():
+        valid = _TABLE_COLUMN_SETS["fault_reports"]
+        keys, params = [], []
+        # sorted so the same column set always yields the same cached SQL
+        for key, value in sorted(kwargs.items()):
             if key not in valid:
                 continue
             if key == "object_type":
                 value = self.normalize_object_type(value)
-            sets.append(f"{key} = ?")
+            keys.append(key)
             params.append(value)
-        if not sets:
+        if not keys:
             return False
         params.append(fault_id)
-        with self._get_conn() as conn:
+        params.extend(params[:len(keys)])
+        with self._write() as conn:
             cur = conn.execute(
-                f"UPDATE fault_reports SET {', '.join(sets)} WHERE fault_id = ?", params
+                self._update_sql("fault_reports", "fault_id", tuple(keys), tuple(keys)),
+                params,
             )
-        return cur.rowcount > 0
+            updated = cur.fetchone() is not None
+        return updated
 
     def delete_fault_report(self, fault_id):
         """Delete a single fault report and its associated photos."""
-        with self._get_conn() as conn:
+        with self._write() as conn:
             conn.execute("DELETE FROM fault_photos WHERE fault_id = ?", (fault_id,))
             cur = conn.execute(
-                "DELETE FROM fault_reports WHERE fault_id = ?", (fault_id,)
+                "DELETE FROM fault_reports WHERE fault_id = ? RETURNING 1",
+                (fault_id,),
             )
-        return cur.rowcount > 0
+            deleted = cur.fetchone() is not None
+        return deleted
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_photo_paths(val):
+        """Parse a legacy ';'-joined photo_paths value into a tuple of paths.
+
+        The column survives only for CSV-era rows; it picked up literal
+        'nan' entries when it round-tripped through pandas, so those are
+        dropped. Cached because the same values are re-parsed on every
+        rerun that displays them.
+        """
+        if val is None:
+            return ()
+        return tuple(p for p in str(val).split(";") if p and p.lower() != "nan")
 
     # ------------------------------------------------------------------
     # Fault photos (BLOB storage)
     # ------------------------------------------------------------------
 
-    def save_fault_photo(self, fault_id, filename, mime_type, data):
-        """Store a photo BLOB for *fault_id*. Returns the new photo_id."""
-        with self._get_conn() as conn:
-            row = conn.execute(
-                "SELECT MAX(CAST(SUBSTR(photo_id, 5) AS INTEGER)) FROM fault_photos"
-            ).fetchone()
-            photo_id = f"PHO-{(row[0] or 0) + 1:05d}"
-            conn.execute(
-                "INSERT INTO fault_photos (photo_id, fault_id, filename, mime_type, data) "
-                "VALUES (?,?,?,?,?)",
-                (photo_id, fault_id, filename, mime_type, data),
+    _BLOB_CHUNK = 1024 * 1024  # stream file-like photo data in 1 MiB pieces
+
+    def save_fault_photo(self, fault_id, filename, mime_type, data, thumb_data=None):
+        """Store a photo BLOB for *fault_id*. Returns the new photo_id.
+
+        *data* may be bytes or a seekable file-like object. File-like
+        objects are streamed into the BLOB in 1 MiB chunks through the
+        incremental blob API, so a multi-megabyte upload never has to be
+        materialized as a Python bytes object.
+
+        *thumb_data* is an optional pre-generated thumbnail stored alongside
+        the original so list views never have to decode the full image.
+        """
+        stream = None
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            stream = data
+            stream.seek(0, 2)
+            stream_size = stream.tell()
+            stream.seek(0)
+        with self._write() as conn:
+            num = self._next_id(
+                conn, "fault_photos",
+                "SELECT MAX(CAST(SUBSTR(photo_id, 5) AS INTEGER)) FROM fault_photos",
             )
+            photo_id = f"PHO-{num:05d}"
+            if stream is not None and hasattr(conn, "blobopen"):  # Python 3.11+
+                cur = conn.execute(
+                    "INSERT INTO fault_photos (photo_id, fault_id, filename, mime_type, data, thumb_data) "
+                    "VALUES (?,?,?,?,zeroblob(?),?)",
+                    (photo_id, fault_id, filename, mime_type, stream_size, thumb_data),
+                )
+                with conn.blobopen("fault_photos", "data", cur.lastrowid) as blob:
+                    while chunk := stream.read(self._BLOB_CHUNK):
+                        blob.write(chunk)
+            else:
+                if stream is not None:
+                    data = stream.read()
+                conn.execute(
+                    "INSERT INTO fault_photos (photo_id, fault_id, filename, mime_type, data, thumb_data) "
+                    "VALUES (?,?,?,?,?,?)",
+                    (photo_id, fault_id, filename, mime_type, data, thumb_data),
+                )
         return photo_id
 
+    def save_fault_photos_bulk(self, fault_id, items):
+        """Store several photos for *fault_id* in a single transaction.
+
+        *items* is an iterable of (filename, mime_type, data, thumb_data)
+        tuples; data may be bytes or a file-like object (read in full
+        here – the incremental streaming path is save_fault_photo).
+        Returns the list of new photo_ids. N photos cost one commit
+        instead of N.
+        """
+        items = list(items)
+        if not items:
+            return []
+        with self._write() as conn:
+            next_num = self._next_id(
+                conn, "fault_photos",
+                "SELECT MAX(CAST(SUBSTR(photo_id, 5) AS INTEGER)) FROM fault_photos",
+                count=len(items),
+            )
+            rows, photo_ids = [], []
+            for i, (filename, mime_type, data, thumb_data) in enumerate(items):
+                if not isinstance(data, (bytes, bytearray, memoryview)):
+                    data = data.read()
+                photo_id = f"PHO-{next_num + i:05d}"
+                photo_ids.append(photo_id)
+                rows.append((photo_id, fault_id, filename, mime_type, data, thumb_data))
+            conn.executemany(
+                "INSERT INTO fault_photos (photo_id, fault_id, filename, mime_type, data, thumb_data) "
+                "VALUES (?,?,?,?,?,?)",
+                rows,
+            )
+        return photo_ids
+
     def get_fault_photos(self, fault_id):
-        """Return a list of photo dicts for *fault_id* (photo_id, filename, mime_type, data)."""
-        with self._get_conn() as conn:
+        """Return photo dicts for *fault_id* (photo_id, filename, mime_type, thumb_data).
+
+        Full-resolution bytes are intentionally not loaded here – list views
+        only need the thumbnail. Use get_fault_photo_full() for the original.
+        """
+        with self._read() as conn:
             rows = conn.execute(
-                "SELECT photo_id, filename, mime_type, data FROM fault_photos "
+                "SELECT photo_id, filename, mime_type, thumb_data FROM fault_photos "
                 "WHERE fault_id = ? ORDER BY photo_id",
                 (fault_id,),
             ).fetchall()
         return [
-            {"photo_id": r[0], "filename": r[1], "mime_type": r[2], "data": r[3]}
+            {"photo_id": r[0], "filename": r[1], "mime_type": r[2], "thumb_data": r[3]}
             for r in rows
         ]
 
+    def get_fault_photo_full(self, photo_id):
+        """Return the full-resolution photo bytes for *photo_id* (or None)."""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT data FROM fault_photos WHERE photo_id = ?", (photo_id,)
+            ).fetchone()
+        return row[0] if row else None
+
     def delete_fault_photo(self, photo_id):
         """Delete a single fault photo by photo_id."""
-        with self._get_conn() as conn:
-            cur = conn.execute("DELETE FROM fault_photos WHERE photo_id = ?", (photo_id,))
-        return cur.rowcount > 0
+        with self._write() as conn:
+            cur = conn.execute(
+                "DELETE FROM fault_photos WHERE photo_id = ? RETURNING 1", (photo_id,)
+            )
+            deleted = cur.fetchone() is not None
+        return deleted
 
     def delete_fault_photos(self, fault_id):
         """Delete all photos for a fault report."""
-        with self._get_conn() as conn:
+        with self._write() as conn:
             conn.execute("DELETE FROM fault_photos WHERE fault_id = ?", (fault_id,))
 
     # ------------------------------------------------------------------
     # Admin: delete all records for a user
     # ------------------------------------------------------------------
 
+    def get_admin_overview(self):
+        """Return (objects, services, reminders, reports, fault_reports)
+        for the Admin Panel, all read on one connection.
+
+        One connection means one open/lock round trip and, under WAL, a
+        single reader snapshot across all five tables instead of five.
+        Columns are listed explicitly (schema order) and the frames use
+        the pyarrow dtype backend when available, so Streamlit can hand
+        them to Arrow without an object-dtype conversion pass.
+        """
+        with self._read() as conn:
+            return tuple(
+                self._norm_df(pd.read_sql_query(
+                    f"SELECT {', '.join(_TABLE_COLUMNS[table])} FROM {table}",
+                    conn, **_READ_SQL_KWARGS))
+                for table in ("objects", "services", "reminders",
+                              "reports", "fault_reports")
+            )
+
     def delete_user_data(self, user_email):
         """Delete all records belonging to *user_email* across every table."""
         # Table names are hardcoded string literals, not user input – safe to interpolate.
-        with self._get_conn() as conn:
+        with self._write() as conn:
             # Delete photos for all fault reports belonging to this user first.
             conn.execute(
                 "DELETE FROM fault_photos WHERE fault_id IN "
@@ -1,24 +1,46 @@
 """
 Email utility for sending service reminder notifications
 """
+import functools
 import smtplib
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import yaml
 from datetime import datetime, date
 import os
 
+
+@functools.lru_cache(maxsize=4)
+def _read_config(path, mtime):
+    """Parse *path*, cached on (path, mtime)
+
+    EmailNotifier is instantiated per page run, so without this the
+    YAML is re-read and re-parsed on every rerun; the mtime key means
+    an edited config file still takes effect immediately.
+    """
+    with open(path, 'r') as f:
+        return yaml.safe_load(f)
+
+
 class EmailNotifier:
+    # Parallel SMTP sessions for large batches
+    _SMTP_MAX_WORKERS = 4
+
     def __init__(self):
         self.config_file = "email_config.yaml"
         self.config = self._load_config()
-    
+        # Resolve the template strings once per notifier instead of per email
+        template = (self.config or {}).get('template', {})
+        self._subject_tmpl = template.get('subject', '')
+        self._body_tmpl = template.get('body', '')
+
     def _load_config(self):
         """Load email configuration from YAML file"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    return yaml.safe_load(f)
+                return _read_config(self.config_file,
+                                    os.path.getmtime(self.config_file))
             return None
         except Exception as e:
             print(f"Error loading email config: {e}")
@@ -30,125 +52,165 @@ class EmailNotifier:
             return False
         return self.config.get('smtp', {}).get('enabled', False)
     
+    def _build_message(self, to_email, user_name, reminder_data):
+        """Build the MIMEMultipart message for one reminder"""
+        smtp_config = self.config['smtp']
+
+        # Format email subject and body
+        subject = self._subject_tmpl.format(**reminder_data)
+        body = self._body_tmpl.format(
+            user_name=user_name,
+            **reminder_data
+        )
+
+        msg = MIMEMultipart()
+        msg['From'] = f"{smtp_config.get('from_name', 'mymaintlog')} <{smtp_config['from_email']}>"
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        return msg
+
     def send_reminder_email(self, to_email, user_name, reminder_data):
         """
         Send a reminder email
-        
+
         Args:
             to_email: Recipient email address
             user_name: Name of the user
             reminder_data: Dict with reminder details (object_name, object_type, service_name, etc.)
-        
+
         Returns:
             bool: True if email sent successfully, False otherwise
         """
         if not self.is_enabled():
             print("Email notifications are disabled")
             return False
-        
+
+        try:
+            msg = self._build_message(to_email, user_name, reminder_data)
+        except Exception as e:
+            print(f"Error building email: {e}")
+            return False
+        return self.send_reminder_emails_bulk([msg])[0]
+
+    def send_reminder_emails_bulk(self, messages):
+        """
+        Send prepared messages over a single SMTP connection
+
+        Connecting, negotiating TLS and authenticating once per batch
+        replaces the per-email handshake – for N emails that is one
+        round of connection setup instead of N.
+
+        Args:
+            messages: List of MIMEMultipart messages ready to send
+
+        Returns:
+            list[bool]: Per-message success flags, parallel to *messages*
+        """
+        if not messages:
+            return []
+        if not self.is_enabled():
+            print("Email notifications are disabled")
+            return [False] * len(messages)
+
+        # Sending is latency-bound on server ACKs, so larger batches are
+        # split across a few workers, each with its own SMTP session –
+        # the RTTs overlap instead of accumulating. Small batches stay
+        # on a single connection; parallel sessions wouldn't pay for
+        # their extra handshakes.
+        workers = min(self._SMTP_MAX_WORKERS, len(messages) // 2)
+        if workers < 2:
+            return self._send_batch(messages)
+        slices = [messages[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            slice_results = list(ex.map(self._send_batch, slices))
+        # Undo the round-robin split so results stay parallel to *messages*
+        results = [False] * len(messages)
+        for offset, sub in enumerate(slice_results):
+            for j, ok in enumerate(sub):
+                results[offset + j * workers] = ok
+        return results
+
+    def _send_batch(self, messages):
+        """Send *messages* over one SMTP connection; returns per-message flags"""
+        results = []
         try:
             smtp_config = self.config['smtp']
-            template = self.config['template']
-            
-            # Format email subject and body
-            subject = template['subject'].format(**reminder_data)
-            body = template['body'].format(
-                user_name=user_name,
-                **reminder_data
-            )
-            
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = f"{smtp_config.get('from_name', 'mymaintlog')} <{smtp_config['from_email']}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Send email
             with smtplib.SMTP(smtp_config['server'], smtp_config['port']) as server:
                 if smtp_config.get('use_tls', True):
                     server.starttls()
                 server.login(smtp_config['username'], smtp_config['password'])
-                server.send_message(msg)
-            
-            print(f"Email sent successfully to {to_email}")
-            return True
-            
+                for msg in messages:
+                    try:
+                        server.send_message(msg)
+                        print(f"Email sent successfully to {msg['To']}")
+                        results.append(True)
+                    except Exception as e:
+                        print(f"Error sending email to {msg['To']}: {e}")
+                        results.append(False)
         except Exception as e:
+            # Connection/auth failure – everything not yet attempted failed
             print(f"Error sending email: {e}")
-            return False
+            results.extend([False] * (len(messages) - len(results)))
+        return results
     
-    def check_and_send_pending_reminders(self, reminders_df, users_config, data_handler=None):
+    def check_and_send_pending_reminders(self, users_config, data_handler):
         """
-        Check for reminders that need email notifications and send them
-        
+        Send email notifications for all reminders that are due
+
+        The eligibility filter (pending, email enabled, not yet sent,
+        due today or earlier) runs in SQL via
+        DataHandler.get_due_email_reminders, so only actionable rows
+        reach this loop.
+
         Args:
-            reminders_df: DataFrame of reminders
             users_config: User configuration to get user names
-            data_handler: DataHandler instance to update email_sent status
-        
+            data_handler: DataHandler instance to query and update reminders
+
         Returns:
             int: Number of emails sent
         """
-        if not self.is_enabled() or reminders_df.empty:
+        if not self.is_enabled() or data_handler is None:
             return 0
-        
-        import pandas as pd
-        from datetime import date
-        
-        emails_sent = 0
-        today = date.today()
-        
-        for _, reminder in reminders_df.iterrows():
-            # Check if email notification is enabled for this reminder
-            if not reminder.get('email_notification', False):
-                continue
-            
-            # Check if reminder is pending
-            if reminder.get('status', '') != 'Pending':
-                continue
-            
-            # Check if email was already sent
-            if reminder.get('email_sent', False):
-                continue
-            
-            # Parse reminder date and time
+
+        today = date.today().isoformat()
+        users_dict = users_config.get('credentials', {}).get('usernames', {})
+
+        # Build all messages first, then send the batch over one connection
+        to_send = []
+        for reminder in data_handler.get_due_email_reminders(today):
             try:
-                reminder_date = pd.to_datetime(reminder['reminder_date']).date()
-                notification_time = reminder.get('notification_time', '09:00')
-                
-                # Check if today is the reminder date or after
-                if today >= reminder_date:
-                    # Get user details
-                    user_email = reminder.get('user_email', '')
-                    users_dict = users_config.get('credentials', {}).get('usernames', {})
-                    user_data = users_dict.get(user_email, {})
-                    user_name = user_data.get('name', 'User')
-                    
-                    # Prepare reminder data for email
-                    reminder_data = {
-                        'object_name': reminder.get('object_id', 'N/A'),
-                        'object_type': reminder.get('object_type', 'N/A'),
-                        'service_name': reminder.get('service_id', 'N/A'),
-                        'reminder_date': reminder.get('reminder_date', 'N/A'),
-                        'notes': reminder.get('notes', 'No additional notes')
-                    }
-                    
-                    # Send email
-                    if self.send_reminder_email(user_email, user_name, reminder_data):
-                        emails_sent += 1
-                        # Mark as sent in CSV
-                        if data_handler:
-                            try:
-                                data_handler.update_reminder(
-                                    reminder.get('reminder_id'), 
-                                    email_sent=True
-                                )
-                            except Exception as e:
-                                print(f"Error updating email_sent status: {e}")
-            
+                # Get user details
+                user_email = reminder.get('user_email', '')
+                user_data = users_dict.get(user_email, {})
+                user_name = user_data.get('name', 'User')
+
+                # Prepare reminder data for email
+                reminder_data = {
+                    'object_name': reminder.get('object_id', 'N/A'),
+                    'object_type': reminder.get('object_type', 'N/A'),
+                    'service_name': reminder.get('service_id', 'N/A'),
+                    'reminder_date': reminder.get('reminder_date', 'N/A'),
+                    'notes': reminder.get('notes', 'No additional notes')
+                }
+
+                msg = self._build_message(user_email, user_name, reminder_data)
+                to_send.append((reminder.get('reminder_id'), msg))
+
             except Exception as e:
                 print(f"Error processing reminder {reminder.get('reminder_id', 'unknown')}: {e}")
                 continue
-        
+
+        results = self.send_reminder_emails_bulk([msg for _, msg in to_send])
+        sent_ids = [rid for (rid, _), ok in zip(to_send, results) if ok]
+        emails_sent = len(sent_ids)
+
+        # Mark everything that went out in one transaction instead of
+        # one UPDATE-commit per reminder
+        if data_handler and sent_ids:
+            try:
+                data_handler.mark_reminders_email_sent(sent_ids)
+            except Exception as e:
+                print(f"Error updating email_sent status: {e}")
+
         return emails_sent